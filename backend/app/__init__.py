@@ -1,3 +1,4 @@
+import threading
 from flask import Flask
 from flask_pymongo import PyMongo
 from flask_jwt_extended import JWTManager
@@ -13,11 +14,19 @@ def create_app():
     # Load config
     app.config.from_object("config.Config")
 
+    # Responses go through orjson when available (JSON_PROVIDER)
+    from app.utils.json_provider import configure_json
+    configure_json(app)
+
     # Initialize extensions
+    from app.metrics import init_metrics, mongo_listeners
     CORS(app)
-    mongo.init_app(app)
+    mongo.init_app(app, event_listeners=mongo_listeners(app))
     jwt.init_app(app)
 
+    # Route, Mongo, LLM and natal-chart metrics at /metrics
+    init_metrics(app)
+
     # Register blueprints
     from app.routes.auth import auth_bp
     from app.routes.users import users_bp
@@ -27,9 +36,30 @@ def create_app():
     app.register_blueprint(users_bp, url_prefix="/users")
     app.register_blueprint(matches_bp, url_prefix="/matches")
 
+    # Indexes: `flask ensure-indexes` / `flask check-query-plans`, or at startup
+    from app.indexes import register_commands
+    register_commands(app)
+    from app.services.reveal import register_commands as register_reveal_commands
+    register_reveal_commands(app)
+    from app.services.charts import register_commands as register_chart_commands
+    register_chart_commands(app)
+    if app.config.get("ENSURE_INDEXES_ON_STARTUP"):
+        # Off the startup path so an unreachable Mongo can't stall boot
+        threading.Thread(
+            target=_bootstrap_indexes, args=(app.config.get("GUEST_TTL_DAYS", 7),), daemon=True
+        ).start()
+
     # Health check
     @app.route("/health")
     def health():
         return {"status": "ok", "app": "orbit"}
 
     return app
+
+
+def _bootstrap_indexes(guest_ttl_days: int):
+    from app.indexes import ensure_indexes
+    try:
+        ensure_indexes(mongo.db, guest_ttl_days)
+    except Exception as e:
+        print(f"Index bootstrap failed: {e}")
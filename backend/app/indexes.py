@@ -0,0 +1,120 @@
+"""Index bootstrap and query-plan checks for the hot-route collections."""
+
+from pymongo import ASCENDING, IndexModel
+
+USER_INDEXES = [
+    IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+    IndexModel([("onboarding_complete", ASCENDING)], name="onboarding_complete"),
+    # Guests who never finish onboarding (the field is unset once they do)
+    IndexModel([("guest_expires_at", ASCENDING)], expireAfterSeconds=0, name="guest_expires_at_ttl"),
+    IndexModel(
+        [("chart_requested_at", ASCENDING)],
+        name="chart_pending",
+        partialFilterExpression={"chart_status": "pending"},
+    ),
+]
+
+MATCH_INDEXES = [
+    IndexModel([("participants", ASCENDING)], name="participants"),
+    IndexModel([("user1_id", ASCENDING)], name="user1_id"),
+    IndexModel([("user2_id", ASCENDING)], name="user2_id"),
+]
+
+
+# Expire at the time stored in expires_at
+TTL_INDEXES = [
+    IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+]
+
+
+def ensure_indexes(db, guest_ttl_days: int = 7) -> dict:
+    """
+    Create every index the routes rely on (idempotent). Also backfills
+    `participants` on match docs written before the field existed, and an
+    expiry on guest docs created before guests got one.
+    Returns {collection: [index names]}.
+    """
+    db.matches.update_many(
+        {"participants": {"$exists": False}},
+        [{"$set": {"participants": ["$user1_id", "$user2_id"]}}],
+    )
+    db.users.update_many(
+        {"is_guest": True, "onboarding_complete": {"$ne": True},
+         "guest_expires_at": {"$exists": False}},
+        [{"$set": {"guest_expires_at": {
+            "$add": ["$created_at", guest_ttl_days * 24 * 60 * 60 * 1000]
+        }}}],
+    )
+    return {
+        "users": db.users.create_indexes(USER_INDEXES),
+        "matches": db.matches.create_indexes(MATCH_INDEXES),
+        "verification_codes": db.verification_codes.create_indexes(TTL_INDEXES),
+        "rate_limits": db.rate_limits.create_indexes(TTL_INDEXES),
+    }
+
+
+def hot_queries(db) -> list:
+    """(name, collection, filter, sort) for every query on a hot request path."""
+    from datetime import datetime, timezone
+
+    from app.services.charts import CHART_CLAIM_SORT, claimable_chart_query
+
+    sample_id = db.users.find_one({}, {"_id": 1})
+    sample_id = sample_id["_id"] if sample_id else None
+    return [
+        ("auth: user by email", db.users, {"email": "someone@rollins.edu"}, None),
+        ("matching: onboarded users", db.users, {"onboarding_complete": True}, None),
+        ("worker: claim pending chart", db.users,
+         claimable_chart_query(datetime.now(timezone.utc)), CHART_CLAIM_SORT),
+        ("matches/me: match by participant", db.matches, {"participants": sample_id}, None),
+    ]
+
+
+def _stages(plan: dict):
+    """Yield every stage name in an explain() plan tree."""
+    if not plan:
+        return
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+
+def check_query_plans(db) -> list:
+    """Return a failure message for every hot query whose winning plan is a COLLSCAN."""
+    failures = []
+    for name, collection, query, sort in hot_queries(db):
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = cursor.explain()
+        winning = explain.get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in set(_stages(winning)):
+            failures.append(f"{name}: COLLSCAN on {collection.name} for {query}")
+    return failures
+
+
+def register_commands(app):
+    """`flask ensure-indexes` and `flask check-query-plans`."""
+    import click
+
+    @app.cli.command("ensure-indexes")
+    def ensure_indexes_command():
+        from app import mongo
+
+        guest_ttl_days = app.config.get("GUEST_TTL_DAYS", 7)
+        for collection, names in ensure_indexes(mongo.db, guest_ttl_days).items():
+            click.echo(f"{collection}: {', '.join(names)}")
+
+    @app.cli.command("check-query-plans")
+    def check_query_plans_command():
+        from app import mongo
+
+        failures = check_query_plans(mongo.db)
+        for failure in failures:
+            click.echo(f"FAIL {failure}", err=True)
+        if failures:
+            raise SystemExit(1)
+        click.echo("All hot-route queries use an index")
@@ -0,0 +1,133 @@
+"""
+Prometheus metrics for routes, Mongo commands, user loads, LLM calls and natal
+charts.
+
+Recording is a dict lookup plus a lock-protected add per observation, so it
+stays on in production. Under gunicorn with several workers, set
+PROMETHEUS_MULTIPROC_DIR so /metrics aggregates every worker.
+"""
+
+import hmac
+import os
+import time
+
+from flask import Response, current_app, g, jsonify, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from pymongo import monitoring
+
+HTTP_REQUESTS = Counter(
+    "orbit_http_requests_total", "HTTP requests by route and status",
+    ["method", "endpoint", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "orbit_http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "endpoint"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+MONGO_COMMANDS = Counter(
+    "orbit_mongo_commands_total", "MongoDB commands by collection and outcome",
+    ["command", "collection", "outcome"],
+)
+MONGO_LATENCY = Histogram(
+    "orbit_mongo_command_duration_seconds", "MongoDB command latency",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+LLM_LATENCY = Histogram(
+    "orbit_llm_request_duration_seconds", "OpenAI completion latency by outcome",
+    ["outcome"],  # success | error
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32),
+)
+LLM_DESCRIPTIONS = Counter(
+    "orbit_llm_descriptions_total", "Match descriptions by source",
+    ["source"],  # llm | fallback | cache
+)
+USER_LOADS = Counter(
+    "orbit_user_loads_total", "load_user lookups by route and where the doc came from",
+    ["endpoint", "outcome"],  # request | lru | miss
+)
+CHART_LATENCY = Histogram(
+    "orbit_natal_chart_duration_seconds", "Natal chart computation time by result",
+    ["status"],  # complete | sun_only
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """pymongo listener: per-command latency and counts, labelled by collection."""
+
+    def __init__(self):
+        # request_id -> collection for commands in flight
+        self._collections = {}
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        self._collections[event.request_id] = target if isinstance(target, str) else ""
+
+    def succeeded(self, event):
+        self._record(event, "success")
+
+    def failed(self, event):
+        self._record(event, "failure")
+
+    def _record(self, event, outcome: str):
+        collection = self._collections.pop(event.request_id, "")
+        MONGO_COMMANDS.labels(event.command_name, collection, outcome).inc()
+        MONGO_LATENCY.labels(event.command_name).observe(event.duration_micros / 1e6)
+
+
+def mongo_listeners(app) -> list:
+    """event_listeners for the app's MongoClient (none when metrics are off)."""
+    return [CommandMetrics()] if app.config.get("METRICS_ENABLED", True) else []
+
+
+def init_metrics(app):
+    """Time every request and serve /metrics (METRICS_TOKEN, if set, guards it)."""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+    app.add_url_rule("/metrics", "metrics", _metrics)
+
+
+def _start_timer():
+    g._metrics_started = time.perf_counter()
+
+
+def _record_request(response):
+    started = g.pop("_metrics_started", None)
+    if started is None:
+        return response
+    # The route's endpoint name, not the path, so ids don't explode the label set
+    endpoint = request.endpoint or "unmatched"
+    HTTP_LATENCY.labels(request.method, endpoint).observe(time.perf_counter() - started)
+    HTTP_REQUESTS.labels(request.method, endpoint, str(response.status_code)).inc()
+    return response
+
+
+def _metrics():
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()
+    ):
+        return jsonify({"error": "Unauthorized"}), 401
+    return Response(generate_latest(_registry()), content_type=CONTENT_TYPE_LATEST)
+
+
+def _registry():
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    from prometheus_client import multiprocess
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
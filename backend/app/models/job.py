@@ -0,0 +1,47 @@
+"""Background job model helpers for MongoDB."""
+
+from datetime import datetime, timezone
+
+
+def create_job_doc(job_type: str, params: dict = None) -> dict:
+    """Create a new queued job document."""
+    now = datetime.now(timezone.utc)
+    return {
+        "type": job_type,
+        "params": params or {},
+        "status": "queued",    # "queued" | "running" | "succeeded" | "failed"
+        "active": True,        # unset once finished; unique while set
+        "phase": None,
+        "progress": {},
+        "timings": {},
+        "result": None,
+        "error": None,
+        "created_at": now,
+        "started_at": None,
+        "finished_at": None,
+        "heartbeat_at": now,
+    }
+
+
+def serialize_job(job: dict) -> dict:
+    """Convert MongoDB job doc to JSON-safe dict."""
+    if not job:
+        return None
+
+    def iso(value):
+        return value.isoformat() if value else None
+
+    return {
+        "id": str(job["_id"]),
+        "type": job.get("type"),
+        "params": job.get("params", {}),
+        "status": job.get("status"),
+        "phase": job.get("phase"),
+        "progress": job.get("progress", {}),
+        "timings": job.get("timings", {}),
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": iso(job.get("created_at")),
+        "started_at": iso(job.get("started_at")),
+        "finished_at": iso(job.get("finished_at")),
+    }
@@ -2,6 +2,32 @@
 
 from datetime import datetime, timezone
 
+# Partner fields serialize_match exposes (with defaults); everything else stays in Mongo
+PARTNER_FIELDS = {
+    "name": "",
+    "zodiac": {},
+    "hobbies": [],
+    "instagram": None,
+    "phone": None,
+}
+PARTNER_PROJECTION = {field: 1 for field in PARTNER_FIELDS}
+
+# Match fields serialize_match / the /matches/me bodies read
+MATCH_FIELDS = {
+    "compatibility_score": 0,
+    "astro_breakdown": {},
+    "cosmic_description": "",
+    "match_type": "valentine",
+    "revealed": False,
+    "reveal_date": None,
+}
+MATCH_PROJECTION = {
+    **{field: 1 for field in MATCH_FIELDS},
+    "user1_id": 1,
+    "user2_id": 1,
+    "created_at": 1,
+}
+
 
 def create_match_doc(
     user1_id,
@@ -16,6 +42,7 @@ def create_match_doc(
     return {
         "user1_id": user1_id,
         "user2_id": user2_id,
+        "participants": [user1_id, user2_id],  # indexed per-user lookup
         "compatibility_score": compatibility_score,
         "astro_breakdown": astro_breakdown,
         "cosmic_description": cosmic_description,
@@ -31,24 +58,14 @@ def serialize_match(match: dict, partner: dict = None) -> dict:
     if not match:
         return None
 
-    result = {
-        "id": str(match["_id"]),
-        "compatibility_score": match.get("compatibility_score", 0),
-        "astro_breakdown": match.get("astro_breakdown", {}),
-        "cosmic_description": match.get("cosmic_description", ""),
-        "match_type": match.get("match_type", "valentine"),
-        "revealed": match.get("revealed", False),
-        "reveal_date": match.get("reveal_date"),
-        "created_at": match.get("created_at", "").isoformat() if match.get("created_at") else None,
-    }
+    result = {"id": str(match["_id"])}
+    result.update({field: match.get(field, default) for field, default in MATCH_FIELDS.items()})
+    created_at = match.get("created_at")
+    result["created_at"] = created_at.isoformat() if created_at else None
 
     if partner:
         result["partner"] = {
-            "name": partner.get("name", ""),
-            "zodiac": partner.get("zodiac", {}),
-            "hobbies": partner.get("hobbies", []),
-            "instagram": partner.get("instagram"),
-            "phone": partner.get("phone"),
+            field: partner.get(field, default) for field, default in PARTNER_FIELDS.items()
         }
 
     return result
@@ -1,6 +1,6 @@
 """User model helpers for MongoDB."""
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 
@@ -32,38 +32,64 @@ def create_user_doc(
             "moon": None,
             "rising": None,
         },
+        "chart_status": None,  # "pending" | "complete" | "sun_only", see app.services.charts
+        "chart_requested_at": None,
+        "chart_claimed_at": None,
         "school": "rollins",
         "onboarding_complete": False,
-        "verification_code": None,
         "email_verified": is_guest,  # guests skip verification
         "created_at": datetime.now(timezone.utc),
         "updated_at": datetime.now(timezone.utc),
     }
 
 
+def create_guest_doc(user_id, ttl_days: int = 7, created_at: datetime = None) -> dict:
+    """
+    Guest user doc. Guests live only in their JWT until they first save a
+    profile; the doc then expires via the guest_expires_at TTL index unless
+    they finish onboarding.
+    """
+    doc = create_user_doc(email=f"guest_{user_id}@orbit.guest", is_guest=True)
+    doc["_id"] = user_id
+    if created_at is not None:
+        doc["created_at"] = doc["updated_at"] = created_at
+    doc["guest_expires_at"] = doc["created_at"] + timedelta(days=ttl_days)
+    return doc
+
+
+# Fields serialize_user exposes, with the default for docs that lack them.
+# Routes read users with USER_PROJECTION, so password_hash and other
+# stored secrets never leave Mongo for a profile response.
+USER_FIELDS = {
+    "email": "",
+    "is_guest": False,
+    "name": "",
+    "dob": None,
+    "birth_time": None,
+    "birth_location": None,
+    "phone": None,
+    "instagram": None,
+    "hobbies": [],
+    "year": None,
+    "vibe_answers": {},
+    "looking_for": None,
+    "gender": None,
+    "interested_in": [],
+    "zodiac": {},
+    "chart_status": None,
+    "school": "rollins",
+    "onboarding_complete": False,
+    "email_verified": False,
+}
+USER_PROJECTION = {**{field: 1 for field in USER_FIELDS}, "created_at": 1}
+
+
 def serialize_user(user: dict) -> dict:
-    """Convert MongoDB user doc to JSON-safe dict."""
+    """Convert MongoDB user doc (full or USER_PROJECTION) to JSON-safe dict."""
     if not user:
         return None
-    return {
-        "id": str(user["_id"]),
-        "email": user.get("email", ""),
-        "is_guest": user.get("is_guest", False),
-        "name": user.get("name", ""),
-        "dob": user.get("dob"),
-        "birth_time": user.get("birth_time"),
-        "birth_location": user.get("birth_location"),
-        "phone": user.get("phone"),
-        "instagram": user.get("instagram"),
-        "hobbies": user.get("hobbies", []),
-        "year": user.get("year"),
-        "vibe_answers": user.get("vibe_answers", {}),
-        "looking_for": user.get("looking_for"),
-        "gender": user.get("gender"),
-        "interested_in": user.get("interested_in", []),
-        "zodiac": user.get("zodiac", {}),
-        "school": user.get("school", "rollins"),
-        "onboarding_complete": user.get("onboarding_complete", False),
-        "email_verified": user.get("email_verified", False),
-        "created_at": user.get("created_at", "").isoformat() if user.get("created_at") else None,
-    }
+    result = {"id": str(user["_id"])}
+    result.update({field: user.get(field, default) for field, default in USER_FIELDS.items()})
+    created_at = user.get("created_at")
+    result["created_at"] = created_at.isoformat() if created_at else None
+    return result
@@ -1,17 +1,64 @@
 """Authentication routes: register, verify, login, guest."""
 
-import uuid
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import create_access_token
 from bson.objectid import ObjectId
-import bcrypt
 
 from app import mongo
-from app.models.user import create_user_doc, serialize_user
-from app.utils.email import validate_school_email, generate_verification_code, send_verification_email
+from app.models.user import USER_PROJECTION, create_guest_doc, create_user_doc, serialize_user
+from app.services.passwords import HashingBusy, hash_password
+from app.services.user_cache import invalidate_user
+from app.services.verification import CODE_LOCKED, CODE_OK, check_code, issue_code
+from app.utils.email import validate_school_email, send_verification_email
+from app.utils.rate_limit import build_limiter
 
 auth_bp = Blueprint("auth", __name__)
 
+_limiters = {}
+
+
+def _limiter(scope: str):
+    """Per-IP / per-email token buckets, built once from config."""
+    if scope not in _limiters:
+        config = current_app.config
+        _limiters[scope] = build_limiter(
+            config.get("AUTH_RATE_LIMIT_BACKEND", "memory"),
+            mongo.db.rate_limits,
+            config.get(f"AUTH_RATE_PER_MINUTE_{scope.upper()}", 10),
+            config.get(f"AUTH_RATE_BURST_{scope.upper()}", 10),
+        )
+    return _limiters[scope]
+
+
+def _client_ip() -> str:
+    """Client address, skipping the configured number of trusted proxies."""
+    hops = current_app.config.get("TRUSTED_PROXY_COUNT", 0)
+    route = request.access_route
+    if hops and len(route) >= hops:
+        return route[-hops]
+    return request.remote_addr or "unknown"
+
+
+@auth_bp.before_request
+def rate_limit():
+    """Token-bucket limits per client IP and per email on every /auth route."""
+    if not current_app.config.get("AUTH_RATE_LIMIT_ENABLED", True):
+        return None
+
+    keys = [("ip", _client_ip())]
+    data = request.get_json(silent=True) or {}
+    email = data.get("email") if isinstance(data, dict) else None
+    if isinstance(email, str) and email.strip():
+        keys.append(("email", email.strip().lower()))
+
+    for scope, value in keys:
+        allowed, retry_after = _limiter(scope).allow(f"auth:{scope}:{value}")
+        if not allowed:
+            response = jsonify({"error": "Too many requests. Please slow down."})
+            response.headers["Retry-After"] = str(max(int(retry_after + 0.999), 1))
+            return response, 429
+    return None
+
 
 @auth_bp.route("/register", methods=["POST"])
 def register():
@@ -28,30 +75,28 @@ def register():
         return jsonify({"error": f"Please use your school email (@{', @'.join(allowed_domains)})"}), 400
 
     # Check if user already exists
-    existing = mongo.db.users.find_one({"email": email})
+    existing = mongo.db.users.find_one({"email": email}, {"email_verified": 1})
     if existing and existing.get("email_verified"):
         return jsonify({"error": "Account already exists. Please log in."}), 409
 
-    # Generate verification code
-    code = generate_verification_code()
-
-    if existing:
-        # Update verification code for unverified user
-        mongo.db.users.update_one(
-            {"_id": existing["_id"]},
-            {"$set": {"verification_code": code}}
-        )
-    else:
+    if not existing:
         # Create new user
         password = data.get("password", "")
         password_hash = ""
         if password:
-            password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+            try:
+                password_hash = hash_password(password)
+            except HashingBusy:
+                response = jsonify({"error": "Too many sign-ups right now. Please try again."})
+                response.headers["Retry-After"] = "1"
+                return response, 503
 
         user_doc = create_user_doc(email=email, password_hash=password_hash)
-        user_doc["verification_code"] = code
         mongo.db.users.insert_one(user_doc)
 
+    # Unverified users re-registering just get a fresh code; the user doc isn't touched
+    code = issue_code(email, current_app.config.get("VERIFICATION_CODE_TTL_SECONDS", 600))
+
     # Send verification email (for MVP, code is in response)
     send_verification_email(email, code)
 
@@ -73,18 +118,23 @@ def verify():
     if not email or not code:
         return jsonify({"error": "Email and code are required"}), 400
 
-    user = mongo.db.users.find_one({"email": email})
+    user = mongo.db.users.find_one({"email": email}, USER_PROJECTION)
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    if user.get("verification_code") != code:
+    result = check_code(email, code, current_app.config.get("VERIFICATION_MAX_ATTEMPTS", 5))
+    if result == CODE_LOCKED:
+        return jsonify({"error": "Too many attempts. Please request a new code."}), 429
+    if result != CODE_OK:
         return jsonify({"error": "Invalid verification code"}), 400
 
-    # Mark as verified
-    mongo.db.users.update_one(
-        {"_id": user["_id"]},
-        {"$set": {"email_verified": True, "verification_code": None}}
-    )
+    # Mark as verified (first time only; logins don't rewrite the user doc)
+    if not user.get("email_verified"):
+        mongo.db.users.update_one(
+            {"_id": user["_id"], "email_verified": {"$ne": True}},
+            {"$set": {"email_verified": True}}
+        )
+        invalidate_user(str(user["_id"]))
 
     # Generate JWT
     token = create_access_token(identity=str(user["_id"]))
@@ -105,16 +155,12 @@ def login():
     if not email:
         return jsonify({"error": "Email is required"}), 400
 
-    user = mongo.db.users.find_one({"email": email})
+    user = mongo.db.users.find_one({"email": email}, {"_id": 1})
     if not user:
         return jsonify({"error": "No account found. Please register first."}), 404
 
     # Send new verification code for passwordless login
-    code = generate_verification_code()
-    mongo.db.users.update_one(
-        {"_id": user["_id"]},
-        {"$set": {"verification_code": code}}
-    )
+    code = issue_code(email, current_app.config.get("VERIFICATION_CODE_TTL_SECONDS", 600))
     send_verification_email(email, code)
 
     return jsonify({
@@ -126,16 +172,14 @@ def login():
 
 @auth_bp.route("/guest", methods=["POST"])
 def guest():
-    """Create a guest account. Returns JWT immediately."""
-    guest_id = f"guest_{uuid.uuid4().hex[:8]}"
-    guest_email = f"{guest_id}@orbit.guest"
-
-    user_doc = create_user_doc(email=guest_email, is_guest=True)
-    result = mongo.db.users.insert_one(user_doc)
-
-    token = create_access_token(identity=str(result.inserted_id))
-
-    user_doc["_id"] = result.inserted_id
+    """
+    Create a guest account. Returns JWT immediately. Nothing is written until
+    the guest first saves a profile: the `guest` claim stands in for the doc.
+    """
+    user_id = ObjectId()
+    token = create_access_token(identity=str(user_id), additional_claims={"guest": True})
+
+    user_doc = create_guest_doc(user_id, current_app.config.get("GUEST_TTL_DAYS", 7))
     return jsonify({
         "token": token,
         "user": serialize_user(user_doc),
@@ -6,34 +6,69 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from bson.objectid import ObjectId
 
 from app import mongo
-from app.models.match import serialize_match
+from app.models.match import MATCH_PROJECTION, PARTNER_PROJECTION
+from app.models.job import serialize_job
+from app.services.reveal import get_reveal_payload, reveal_date, teaser_body, revealed_body
+from app.services.user_loader import load_user
 
 matches_bp = Blueprint("matches", __name__)
 
 
+def _is_admin(secret: str) -> bool:
+    return bool(secret) and secret == current_app.config.get("SECRET_KEY")
+
+
 @matches_bp.route("/generate", methods=["POST"])
 def generate_matches():
     """
-    Admin endpoint: Generate matches for all onboarded users.
+    Admin endpoint: Queue a matching job for all onboarded users.
+    The worker process runs it; poll /matches/jobs/<id> for progress.
     In production, protect with admin auth. For MVP, use a simple secret.
     """
     data = request.get_json() or {}
     admin_secret = data.get("admin_secret", "")
 
-    if admin_secret != current_app.config.get("SECRET_KEY"):
+    if not _is_admin(admin_secret):
         return jsonify({"error": "Unauthorized"}), 401
 
-    from app.services.matching import run_matching
+    from app.services.jobs import enqueue_matching_job
+
+    params = {key: data[key] for key in ("engine", "mode") if data.get(key)}
+    job, created = enqueue_matching_job(
+        params, stale_after=current_app.config.get("JOB_STALE_SECONDS", 600)
+    )
 
-    try:
-        results = run_matching()
+    if not created:
         return jsonify({
-            "message": "Matching complete",
-            "matches_created": results["matches_created"],
-            "users_matched": results["users_matched"],
-        }), 200
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+            "error": "A matching job is already queued or running",
+            "job": serialize_job(job),
+        }), 409
+
+    return jsonify({
+        "message": "Matching job queued",
+        "job_id": str(job["_id"]),
+        "job": serialize_job(job),
+    }), 202
+
+
+@matches_bp.route("/jobs/<job_id>", methods=["GET"])
+def get_matching_job(job_id):
+    """Admin endpoint: phase, progress counts, timings and result of a job."""
+    # Header only: a query-string secret would end up in access logs
+    admin_secret = request.headers.get("X-Admin-Secret", "")
+    if not _is_admin(admin_secret):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    if not ObjectId.is_valid(job_id):
+        return jsonify({"error": "Job not found"}), 404
+
+    from app.services.jobs import get_job
+
+    job = get_job(ObjectId(job_id))
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    return jsonify({"job": serialize_job(job)}), 200
 
 
 @matches_bp.route("/me", methods=["GET"])
@@ -43,13 +78,22 @@ def get_my_match():
     user_id = get_jwt_identity()
     user_oid = ObjectId(user_id)
 
-    # Find match where user is either user1 or user2
-    match = mongo.db.matches.find_one({
-        "$or": [
-            {"user1_id": user_oid},
-            {"user2_id": user_oid},
-        ]
-    })
+    reveal_time_passed = datetime.now(timezone.utc) >= reveal_date()
+
+    # Fast path: payload precomputed by the last matching run
+    payload = get_reveal_payload(user_oid)
+    if payload is not None:
+        teaser, revealed, force_revealed = payload
+        body = revealed if reveal_time_passed or force_revealed else teaser
+        return current_app.response_class(body, status=200, mimetype="application/json")
+
+    if reveal_time_passed:
+        # Match + partner projection in a single round trip
+        match = next(mongo.db.matches.aggregate(_match_with_partner_pipeline(user_oid)), None)
+        partner = (match.pop("partner", None) or [None])[0] if match else None
+    else:
+        match = mongo.db.matches.find_one({"participants": user_oid}, MATCH_PROJECTION)
+        partner = None
 
     if not match:
         return jsonify({
@@ -58,40 +102,38 @@ def get_my_match():
             "message": "Your cosmic match is being aligned by the stars...",
         }), 200
 
-    # Determine reveal status
-    reveal_date_str = current_app.config.get("MATCH_REVEAL_DATE", "2026-02-13T20:00:00")
-    reveal_date = datetime.fromisoformat(reveal_date_str).replace(tzinfo=timezone.utc)
-    now = datetime.now(timezone.utc)
-
-    is_revealed = now >= reveal_date or match.get("revealed", False)
+    # `revealed` is derived from the reveal time rather than written per
+    # request; a stored flag still allows an early reveal
+    is_revealed = reveal_time_passed or match.get("revealed", False)
 
     if not is_revealed:
         # Return teaser without partner details
-        return jsonify({
-            "match": {
-                "id": str(match["_id"]),
-                "compatibility_score": match.get("compatibility_score", 0),
-                "match_type": match.get("match_type", "valentine"),
-                "revealed": False,
-                "reveal_date": reveal_date_str,
-            },
-            "status": "countdown",
-            "message": "Your cosmic match will be revealed on Valentine's Eve!",
-        }), 200
-
-    # Full reveal - get partner info
-    partner_id = match["user2_id"] if match["user1_id"] == user_oid else match["user1_id"]
-    partner = mongo.db.users.find_one({"_id": partner_id})
-
-    # Mark as revealed
-    if not match.get("revealed"):
-        mongo.db.matches.update_one(
-            {"_id": match["_id"]},
-            {"$set": {"revealed": True}}
-        )
-
-    return jsonify({
-        "match": serialize_match(match, partner),
-        "status": "revealed",
-        "message": "The stars have aligned!",
-    }), 200
+        reveal_date_str = current_app.config.get("MATCH_REVEAL_DATE", "2026-02-13T20:00:00")
+        return jsonify(teaser_body(match, reveal_date_str)), 200
+
+    if not reveal_time_passed:
+        # Early reveal via the stored flag: partner wasn't fetched above
+        partner_id = match["user2_id"] if match["user1_id"] == user_oid else match["user1_id"]
+        partner = load_user(partner_id)
+
+    return jsonify(revealed_body(match, partner)), 200
+
+
+def _match_with_partner_pipeline(user_oid: ObjectId) -> list:
+    """The user's match with the partner's public fields joined in as `partner`."""
+    return [
+        {"$match": {"participants": user_oid}},
+        {"$limit": 1},
+        {"$project": MATCH_PROJECTION},
+        {"$lookup": {
+            "from": "users",
+            "let": {"partner_id": {
+                "$cond": [{"$eq": ["$user1_id", user_oid]}, "$user2_id", "$user1_id"]
+            }},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$_id", "$$partner_id"]}}},
+                {"$project": PARTNER_PROJECTION},
+            ],
+            "as": "partner",
+        }},
+    ]
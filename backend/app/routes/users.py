@@ -1,28 +1,54 @@
 """User profile routes."""
 
 from datetime import datetime, timezone
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from bson.objectid import ObjectId
 
 from app import mongo
-from app.models.user import serialize_user
+from app.models.user import create_guest_doc, serialize_user
+from app.services.charts import CHART_INPUT_PROJECTION, CHART_PENDING, chart_request_fields, process_chart
+from app.services.reveal import refresh_partner_payloads
+from app.services.user_cache import cached_user_response, invalidate_user
+from app.services.user_loader import load_user
 from app.utils.zodiac_compat import get_sun_sign, SIGN_DESCRIPTIONS, SIGN_EMOJIS
 
 users_bp = Blueprint("users", __name__)
 
 
+def _find_user(user_id: str) -> dict:
+    """The user's doc, or the JWT-only profile of a guest who hasn't saved yet."""
+    user = load_user(user_id)
+    if user is None and get_jwt().get("guest"):
+        user = _unsaved_guest(user_id)
+    return user
+
+
+def _unsaved_guest(user_id: str) -> dict:
+    claims = get_jwt()
+    return create_guest_doc(
+        ObjectId(user_id),
+        current_app.config.get("GUEST_TTL_DAYS", 7),
+        created_at=datetime.fromtimestamp(claims["iat"], timezone.utc),
+    )
+
+
 @users_bp.route("/me", methods=["GET"])
 @jwt_required()
 def get_me():
     """Get current user profile."""
     user_id = get_jwt_identity()
-    user = mongo.db.users.find_one({"_id": ObjectId(user_id)})
 
-    if not user:
-        return jsonify({"error": "User not found"}), 404
+    def build():
+        user = _find_user(user_id)
+        if not user:
+            return {"error": "User not found"}, 404
+        return {"user": serialize_user(user)}, 200
 
-    return jsonify({"user": serialize_user(user)}), 200
+    return cached_user_response(
+        user_id, "me", build,
+        cacheable=lambda body: body["user"]["chart_status"] != CHART_PENDING,
+    )
 
 
 @users_bp.route("/me", methods=["PUT"])
@@ -52,27 +78,11 @@ def update_me():
             update["zodiac"] = update.get("zodiac", {})
             update["zodiac"] = {"sun": sun_sign, "moon": None, "rising": None}
 
-            # If birth_time and location provided, try to calculate moon/rising
-            birth_time = data.get("birth_time") or None
-            birth_location = data.get("birth_location") or None
-
-            if birth_time and birth_location:
-                try:
-                    from app.services.astrology import calculate_natal_chart
-                    chart = calculate_natal_chart(
-                        name=data.get("name", "User"),
-                        year=dob.year,
-                        month=dob.month,
-                        day=dob.day,
-                        hour=int(birth_time.split(":")[0]),
-                        minute=int(birth_time.split(":")[1]),
-                        city=birth_location,
-                    )
-                    if chart:
-                        update["zodiac"] = chart
-                except Exception as e:
-                    print(f"Natal chart calculation failed: {e}")
-                    # Fall back to sun sign only
+            # Moon/rising need birth time and place; the worker fills them in
+            update.update(chart_request_fields(
+                data.get("birth_time") or None,
+                data.get("birth_location") or None,
+            ))
         except ValueError:
             return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
 
@@ -81,14 +91,36 @@ def update_me():
         update["onboarding_complete"] = True
 
     update["updated_at"] = datetime.now(timezone.utc)
+    write = {"$set": update}
+
+    if get_jwt().get("guest"):
+        # A guest's first save creates their doc; later saves just update it
+        write["$setOnInsert"] = {
+            key: value for key, value in _unsaved_guest(user_id).items()
+            if key not in update and key != "_id"
+        }
+    if update.get("onboarding_complete"):
+        # Onboarded guests are kept for matching
+        write.get("$setOnInsert", {}).pop("guest_expires_at", None)
+        write["$unset"] = {"guest_expires_at": ""}
 
     mongo.db.users.update_one(
         {"_id": ObjectId(user_id)},
-        {"$set": update}
+        write,
+        upsert=bool(get_jwt().get("guest")),
     )
+    invalidate_user(user_id)
+
+    if update.get("chart_status") == CHART_PENDING and not current_app.config.get("NATAL_CHART_ASYNC"):
+        # No chart worker (local dev): compute it in the request as before
+        process_chart(mongo.db.users.find_one({"_id": ObjectId(user_id)}, CHART_INPUT_PROJECTION))
+        invalidate_user(user_id)
+
+    # Whoever is matched with this user sees the new profile on reveal
+    refresh_partner_payloads([user_id])
 
     # Return updated user
-    user = mongo.db.users.find_one({"_id": ObjectId(user_id)})
+    user = load_user(user_id)
     return jsonify({"user": serialize_user(user)}), 200
 
 
@@ -97,21 +129,28 @@ def update_me():
 def get_cosmic_profile():
     """Get detailed zodiac profile for the user."""
     user_id = get_jwt_identity()
-    user = mongo.db.users.find_one({"_id": ObjectId(user_id)})
-
-    if not user:
-        return jsonify({"error": "User not found"}), 404
 
-    zodiac = user.get("zodiac", {})
-    sun = zodiac.get("sun")
-
-    profile = {
-        "sun_sign": sun,
-        "moon_sign": zodiac.get("moon"),
-        "rising_sign": zodiac.get("rising"),
-        "sun_description": SIGN_DESCRIPTIONS.get(sun, ""),
-        "sun_emoji": SIGN_EMOJIS.get(sun, ""),
-        "name": user.get("name", ""),
-    }
-
-    return jsonify({"cosmic_profile": profile}), 200
+    def build():
+        user = _find_user(user_id)
+        if not user:
+            return {"error": "User not found"}, 404
+
+        zodiac = user.get("zodiac", {})
+        sun = zodiac.get("sun")
+
+        profile = {
+            "sun_sign": sun,
+            "moon_sign": zodiac.get("moon"),
+            "rising_sign": zodiac.get("rising"),
+            "sun_description": SIGN_DESCRIPTIONS.get(sun, ""),
+            "sun_emoji": SIGN_EMOJIS.get(sun, ""),
+            "name": user.get("name", ""),
+            "chart_status": user.get("chart_status"),
+        }
+        return {"cosmic_profile": profile}, 200
+
+    # Don't pin a pending chart in the cache: the worker can't invalidate it
+    return cached_user_response(
+        user_id, "cosmic", build,
+        cacheable=lambda body: body["cosmic_profile"]["chart_status"] != CHART_PENDING,
+    )
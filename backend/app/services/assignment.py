@@ -0,0 +1,105 @@
+"""Greedy assignment over per-user candidate lists, without ranking every pair."""
+
+import heapq
+
+import numpy as np
+
+from app.services.scoring import score_block
+
+
+class CandidateGreedy:
+    """
+    Same result as taking every compatible pair best first (score desc, then
+    lo, hi) and matching each user once, but only ever holds each user's K
+    best partners. A user whose list runs out while still unmatched gets it
+    refilled from a fresh score against the partners that are still free.
+    """
+
+    def __init__(self, enc: dict, blocks: dict, k: int):
+        self.enc = enc
+        self.k = k
+        self.n = enc["n"]
+        self.members = [np.array(m, dtype=np.int64) for m in blocks["members"]]
+        self.neighbors = blocks["neighbors"]
+        self.bucket_of = np.empty(self.n, dtype=np.int64)
+        for b, idx in enumerate(self.members):
+            self.bucket_of[idx] = b
+        self._pools = {}
+        self.matched = np.zeros(self.n, dtype=bool)
+        self.refills = 0
+
+    def select(self, rows: np.ndarray, cols: np.ndarray, scores: np.ndarray) -> list:
+        """
+        rows/cols/scores: each user's top-K directed edges (see shard_edges).
+        Returns [(score, i, j), ...] with i < j, best first.
+        """
+        order = np.lexsort((cols, -scores, rows))
+        rows, cols, scores = rows[order], cols[order], scores[order]
+        bounds = np.searchsorted(rows, np.arange(self.n + 1))
+
+        # Per user: partner list, score list, next position, and whether the
+        # list holds every compatible partner (then running out means done)
+        self.lists = [None] * self.n
+        heap = []
+        for u in range(self.n):
+            start, end = bounds[u], bounds[u + 1]
+            self.lists[u] = [cols[start:end].tolist(), scores[start:end].tolist(), 0,
+                             end - start < self.k]
+            self._push_next(heap, u)
+
+        selected = []
+        while heap:
+            neg_score, i, j, u = heapq.heappop(heap)
+            if self.matched[u]:
+                continue
+            v = j if u == i else i
+            if self.matched[v]:
+                self._push_next(heap, u)
+                continue
+            self.matched[i] = self.matched[j] = True
+            selected.append((-neg_score, i, j))
+        return selected
+
+    def _push_next(self, heap: list, u: int):
+        while True:
+            partners, scores, pos, complete = self.lists[u]
+            while pos < len(partners) and self.matched[partners[pos]]:
+                pos += 1
+            if pos < len(partners):
+                self.lists[u][2] = pos + 1
+                v = partners[pos]
+                heapq.heappush(heap, (-scores[pos], min(u, v), max(u, v), u))
+                return
+            if complete:
+                return
+            self._refill(u)
+
+    def _refill(self, u: int):
+        """Next K best partners for u among users that are still unmatched."""
+        self.refills += 1
+        pool = self._pool(self.bucket_of[u])
+        pool = pool[~self.matched[pool] & (pool != u)]
+        if not len(pool):
+            self.lists[u] = [[], [], 0, True]
+            return
+
+        block = score_block(self.enc, np.array([u]), pool)
+        keep = block["compatible"][0]
+        pool, totals = pool[keep], block["total"][0][keep]
+        keys = (100 - totals) * self.n + pool
+        if len(keys) > self.k:
+            top = np.argpartition(keys, self.k - 1)[:self.k]
+        else:
+            top = np.arange(len(keys))
+        top = top[np.argsort(keys[top])]
+        self.lists[u] = [pool[top].tolist(), totals[top].tolist(), 0, len(keys) <= self.k]
+
+    def _pool(self, bucket: int) -> np.ndarray:
+        """Every user in a bucket compatible with `bucket`."""
+        if bucket not in self._pools:
+            targets = self.neighbors[bucket]
+            self._pools[bucket] = (
+                np.concatenate([self.members[b] for b in targets])
+                if targets else np.zeros(0, dtype=np.int64)
+            )
+        return self._pools[bucket]
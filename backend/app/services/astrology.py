@@ -1,41 +1,75 @@
 """Astrology calculation service using kerykeion for natal charts."""
 
-from app.utils.zodiac_compat import get_sun_sign
+from functools import lru_cache
+
+from app.utils.gazetteer import resolve_location
+from app.utils.zodiac_compat import SIGNS, get_sun_sign
+
+# kerykeion reports signs abbreviated ("Sco", "Tau"); scoring expects full names
+_FULL_SIGN = {sign[:3]: sign for sign in SIGNS}
 
 
 def calculate_natal_chart(name: str, year: int, month: int, day: int,
                           hour: int, minute: int, city: str) -> dict:
     """
     Calculate a full natal chart (sun, moon, rising) using kerykeion.
+    The city is resolved with the bundled gazetteer, so no network call is made.
     Returns dict with sun, moon, rising signs.
-    Falls back to sun-sign only if kerykeion fails.
+    Falls back to sun-sign only if the city is unknown or kerykeion fails.
     """
+    place = resolve_location(city)
+    if place is None:
+        print(f"Natal chart: unknown birth location {city!r}, using sun sign only")
+        return _sun_only(month, day)
+
     try:
-        from kerykeion import AstrologicalSubject
-
-        subject = AstrologicalSubject(
-            name=name,
-            year=year,
-            month=month,
-            day=day,
-            hour=hour,
-            minute=minute,
-            city=city,
-        )
-
-        return {
-            "sun": subject.sun.get("sign", get_sun_sign(month, day)),
-            "moon": subject.moon.get("sign"),
-            "rising": subject.first_house.get("sign"),
-        }
+        return dict(_chart(year, month, day, hour, minute,
+                           place["lat"], place["lng"], place["tz"]))
     except Exception as e:
         print(f"Kerykeion natal chart failed: {e}")
         # Fallback to manual sun sign calculation
-        return {
-            "sun": get_sun_sign(month, day),
-            "moon": None,
-            "rising": None,
-        }
+        return _sun_only(month, day)
+
+
+@lru_cache(maxsize=4096)
+def _chart(year: int, month: int, day: int, hour: int, minute: int,
+           lat: float, lng: float, tz: str) -> tuple:
+    """Memoized chart keyed on birth moment and resolved location (names don't matter)."""
+    from kerykeion import AstrologicalSubject
+
+    subject = AstrologicalSubject(
+        name="Orbit",
+        year=year,
+        month=month,
+        day=day,
+        hour=hour,
+        minute=minute,
+        lng=lng,
+        lat=lat,
+        tz_str=tz,
+        online=False,
+    )
+
+    return (
+        ("sun", _full_sign(subject.sun.get("sign")) or get_sun_sign(month, day)),
+        ("moon", _full_sign(subject.moon.get("sign"))),
+        ("rising", _full_sign(subject.first_house.get("sign"))),
+    )
+
+
+def _full_sign(sign):
+    """Full sign name for kerykeion's abbreviation (already-full names pass through)."""
+    if not sign:
+        return None
+    return _FULL_SIGN.get(sign[:3].capitalize())
+
+
+def _sun_only(month: int, day: int) -> dict:
+    return {
+        "sun": get_sun_sign(month, day),
+        "moon": None,
+        "rising": None,
+    }
 
 
 def get_element(sign: str) -> str:
@@ -0,0 +1,263 @@
+"""Background natal chart computation, queued on the user doc itself."""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ReturnDocument, UpdateOne
+
+from app import mongo
+from app.metrics import CHART_LATENCY
+from app.services.astrology import calculate_natal_chart
+from app.services.reveal import refresh_partner_payloads
+from app.utils.zodiac_compat import SIGNS
+
+# chart_status values, exposed to clients so they can poll:
+#   "pending"  - queued or being computed by the worker
+#   "complete" - moon and rising are filled in
+#   "sun_only" - no birth time/place, or the chart couldn't be computed
+CHART_PENDING = "pending"
+CHART_COMPLETE = "complete"
+CHART_SUN_ONLY = "sun_only"
+
+# Oldest request first; served by the chart_pending partial index
+CHART_CLAIM_SORT = [("chart_requested_at", 1)]
+
+# What compute_chart / process_chart read from the user doc
+CHART_INPUT_PROJECTION = {"name": 1, "dob": 1, "birth_time": 1, "birth_location": 1,
+                          "chart_requested_at": 1}
+
+
+def chart_request_fields(birth_time, birth_location) -> dict:
+    """Fields update_me sets alongside a freshly computed sun sign."""
+    now = datetime.now(timezone.utc)
+    if birth_time and birth_location:
+        return {"chart_status": CHART_PENDING, "chart_requested_at": now, "chart_claimed_at": None}
+    return {"chart_status": CHART_SUN_ONLY, "chart_requested_at": now, "chart_claimed_at": None}
+
+
+def claim_next_chart(stale_after: int = 120) -> dict:
+    """
+    Atomically claim one pending chart. Claims older than stale_after seconds
+    (a worker died mid-chart) are handed out again.
+    """
+    now = datetime.now(timezone.utc)
+    return mongo.db.users.find_one_and_update(
+        claimable_chart_query(now - timedelta(seconds=stale_after)),
+        {"$set": {"chart_claimed_at": now}},
+        projection=CHART_INPUT_PROJECTION,
+        sort=CHART_CLAIM_SORT,
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def claimable_chart_query(cutoff: datetime) -> dict:
+    """Pending charts that are unclaimed or whose claim is older than cutoff."""
+    return {
+        "chart_status": CHART_PENDING,
+        "$or": [{"chart_claimed_at": None}, {"chart_claimed_at": {"$lt": cutoff}}],
+    }
+
+
+def compute_chart(user: dict) -> dict:
+    """Chart for a user doc's saved birth details; None if they're unusable."""
+    try:
+        dob = datetime.strptime(user["dob"], "%Y-%m-%d")
+        hour, minute = (int(x) for x in user["birth_time"].split(":")[:2])
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+    started = time.perf_counter()
+    chart = calculate_natal_chart(
+        name=user.get("name") or "User",
+        year=dob.year,
+        month=dob.month,
+        day=dob.day,
+        hour=hour,
+        minute=minute,
+        city=user["birth_location"],
+    )
+    status = CHART_COMPLETE if chart and chart.get("moon") and chart.get("rising") else CHART_SUN_ONLY
+    CHART_LATENCY.labels(status).observe(time.perf_counter() - started)
+    return chart
+
+
+def chart_update(chart: dict) -> dict:
+    """
+    $set for a computed chart (or None): moon/rising plus the final status.
+    New signs bump updated_at so incremental matching rescores the user.
+    """
+    complete = bool(chart and chart.get("moon") and chart.get("rising"))
+    now = datetime.now(timezone.utc)
+    update = {"chart_status": CHART_COMPLETE if complete else CHART_SUN_ONLY,
+              "chart_computed_at": now}
+    if complete:
+        update["zodiac.moon"] = chart["moon"]
+        update["zodiac.rising"] = chart["rising"]
+        update["updated_at"] = now
+    return update
+
+
+def process_chart(user: dict) -> bool:
+    """
+    Compute and write back a claimed chart. The write only lands if the user
+    hasn't re-saved their birth details since the claim; otherwise the newer
+    request stays pending and is picked up next. Returns True if written.
+    """
+    update = chart_update(compute_chart(user))
+    update["chart_claimed_at"] = None
+
+    result = mongo.db.users.update_one(
+        {"_id": user["_id"], "chart_requested_at": user.get("chart_requested_at")},
+        {"$set": update},
+    )
+    if result.modified_count != 1:
+        return False
+    # The partner's reveal payload shows this user's signs
+    refresh_partner_payloads([user["_id"]])
+    return True
+
+
+def process_pending_charts(limit: int = 100, stale_after: int = 120) -> int:
+    """Drain up to `limit` pending charts; returns how many were processed."""
+    processed = 0
+    while processed < limit:
+        user = claim_next_chart(stale_after)
+        if user is None:
+            break
+        try:
+            process_chart(user)
+        except Exception as e:
+            print(f"Natal chart for user {user['_id']} failed: {e}")
+            mongo.db.users.update_one(
+                {"_id": user["_id"], "chart_requested_at": user.get("chart_requested_at")},
+                {"$set": {"chart_status": CHART_SUN_ONLY, "chart_claimed_at": None}},
+            )
+        processed += 1
+    return processed
+
+
+BACKFILL_STATE_ID = "natal_charts"
+_BIRTH_FIELDS = ("dob", "birth_time", "birth_location")
+
+
+def backfill_candidates_query(after_id=None) -> dict:
+    """
+    Users with birth details but no usable moon/rising (missing, or stored
+    abbreviated by older chart code), not already queued for the worker.
+    """
+    query = {
+        "dob": {"$nin": [None, ""]},
+        "birth_time": {"$nin": [None, ""]},
+        "birth_location": {"$nin": [None, ""]},
+        "$or": [{"zodiac.moon": {"$nin": SIGNS}}, {"zodiac.rising": {"$nin": SIGNS}}],
+        "chart_status": {"$ne": CHART_PENDING},
+    }
+    if after_id is not None:
+        query["_id"] = {"$gt": after_id}
+    return query
+
+
+def _chart_result(user: dict) -> tuple:
+    """Pool task: (user, chart or None). Top-level so spawn workers can pickle it."""
+    try:
+        return user, compute_chart(user)
+    except Exception as e:
+        print(f"Natal chart for user {user['_id']} failed: {e}")
+        return user, None
+
+
+def _backfill_op(user: dict, update: dict) -> UpdateOne:
+    # Only land if the user hasn't changed their birth details meanwhile
+    guard = {field: user.get(field) for field in _BIRTH_FIELDS}
+    guard["chart_status"] = {"$ne": CHART_PENDING}
+    return UpdateOne({"_id": user["_id"], **guard}, {"$set": update})
+
+
+def backfill_charts(workers: int = None, batch_size: int = 500, restart: bool = False,
+                    limit: int = None, on_batch=None) -> dict:
+    """
+    Compute missing moon/rising signs for existing users in parallel processes.
+    Users are streamed in _id order and written back with one bulk_write per
+    batch; the last written _id is checkpointed in `backfills`, so an
+    interrupted run resumes where it stopped (restart=True starts over).
+    on_batch(stats) is called after every batch.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    state = mongo.db.backfills
+    if restart:
+        state.delete_one({"_id": BACKFILL_STATE_ID})
+    checkpoint = state.find_one({"_id": BACKFILL_STATE_ID}) or {}
+
+    cursor = mongo.db.users.find(
+        backfill_candidates_query(checkpoint.get("last_id")),
+        {"name": 1, **{field: 1 for field in _BIRTH_FIELDS}},
+        batch_size=batch_size,
+    ).sort("_id", 1)
+    if limit:
+        cursor = cursor.limit(limit)
+
+    stats = {"processed": 0, "completed": 0, "sun_only": 0, "skipped": 0,
+             "seconds": 0.0, "users_per_second": 0.0}
+    started = time.perf_counter()
+
+    def flush(batch):
+        results = list(pool.map(_chart_result, batch, chunksize=max(len(batch) // (workers * 4), 1)))
+        updates = [(user, chart_update(chart)) for user, chart in results]
+        written = mongo.db.users.bulk_write(
+            [_backfill_op(user, update) for user, update in updates], ordered=False
+        ).modified_count
+        completed = sum(1 for _, update in updates if update["chart_status"] == CHART_COMPLETE)
+        if written:
+            refresh_partner_payloads([user["_id"] for user in batch])
+
+        stats["processed"] += len(batch)
+        stats["completed"] += completed
+        stats["sun_only"] += len(batch) - completed
+        stats["skipped"] += len(batch) - written
+        stats["seconds"] = round(time.perf_counter() - started, 3)
+        stats["users_per_second"] = round(stats["processed"] / max(stats["seconds"], 1e-9), 1)
+
+        state.update_one(
+            {"_id": BACKFILL_STATE_ID},
+            {"$set": {"last_id": batch[-1]["_id"], "updated_at": datetime.now(timezone.utc)},
+             "$inc": {"processed": len(batch)}},
+            upsert=True,
+        )
+        if on_batch:
+            on_batch(dict(stats))
+
+    workers = workers or multiprocessing.cpu_count()
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        batch = []
+        for user in cursor:
+            batch.append(user)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+    return stats
+
+
+def register_commands(app):
+    """`flask backfill-charts`: fill in moon/rising for users stuck on sun-only."""
+    import click
+
+    @app.cli.command("backfill-charts")
+    @click.option("--workers", type=int, default=None, help="Chart processes (default: CPU count).")
+    @click.option("--batch-size", type=int, default=500, show_default=True)
+    @click.option("--limit", type=int, default=None, help="Stop after this many users.")
+    @click.option("--restart", is_flag=True, help="Ignore the checkpoint and start over.")
+    def backfill_charts_command(workers, batch_size, limit, restart):
+        def report(stats):
+            click.echo(f"{stats['processed']} users ({stats['completed']} charted, "
+                       f"{stats['sun_only']} sun-only, {stats['skipped']} changed meanwhile) "
+                       f"- {stats['users_per_second']} users/s")
+
+        stats = backfill_charts(workers, batch_size, restart, limit, on_batch=report)
+        click.echo(f"Done: {stats['processed']} users in {stats['seconds']}s "
+                   f"({stats['users_per_second']} users/s)")
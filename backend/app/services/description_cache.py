@@ -0,0 +1,201 @@
+"""Cache for LLM cosmic descriptions, keyed by a pair's astro signature."""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ASCENDING
+
+from app import mongo
+
+# Bump whenever the prompt in app.services.llm or the stored template format
+# changes so old blurbs stop matching
+PROMPT_VERSION = 2
+
+# Placeholders stored in place of names / the exact score, so a cached blurb
+# can be reused by any pair with the same signature
+_NAME_TOKENS = ("{{person1}}", "{{person2}}")
+_FIRST_NAME_TOKENS = ("{{person1_first}}", "{{person2_first}}")
+_SCORE_TOKEN = "{{score}}"
+
+
+def _person_key(user: dict) -> tuple:
+    zodiac = user.get("zodiac") or {}
+    hobbies = sorted(set(user.get("hobbies") or []))
+    hobby_hash = hashlib.sha1("\x1f".join(hobbies).encode("utf-8")).hexdigest()[:12]
+    return (
+        zodiac.get("sun") or "",
+        zodiac.get("moon") or "",
+        zodiac.get("rising") or "",
+        hobby_hash,
+    )
+
+
+class DescriptionCache:
+    """
+    Two-level description cache: an in-process LRU in front of a MongoDB
+    collection. Mongo docs expire via a TTL index and the collection is
+    trimmed to max_docs; hit/miss counts are kept for run stats.
+    """
+
+    def __init__(self, collection: str = "description_cache", lru_size: int = 2048,
+                 ttl_days: int = 30, max_docs: int = 50000, score_bucket: int = 5):
+        self.collection = mongo.db[collection]
+        self.lru_size = lru_size
+        self.ttl = timedelta(days=ttl_days)
+        self.max_docs = max_docs
+        self.score_bucket = max(score_bucket, 1)
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.counters = {"lru_hits": 0, "mongo_hits": 0, "misses": 0, "stores": 0, "uncacheable": 0}
+
+    def ensure_indexes(self):
+        self.collection.create_index(
+            [("created_at", ASCENDING)],
+            expireAfterSeconds=int(self.ttl.total_seconds()),
+        )
+
+    def signature(self, user1: dict, user2: dict, score: int) -> tuple:
+        """
+        Return (key, ordered_users): the normalized cache key and the two users
+        in the order the key lists them, so placeholders map back consistently.
+        """
+        people = sorted([(_person_key(user1), 0), (_person_key(user2), 1)])
+        ordered = tuple((user1, user2)[idx] for _, idx in people)
+        raw = json.dumps({
+            "people": [p for p, _ in people],
+            "score_bucket": score // self.score_bucket,
+            "prompt_version": PROMPT_VERSION,
+        })
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest(), ordered
+
+    def get_many(self, pairs: list) -> list:
+        """Look up (user1, user2, score) pairs; returns text or None per pair."""
+        keys = [self.signature(u1, u2, score) for u1, u2, score in pairs]
+        now = datetime.now(timezone.utc)
+
+        templates = {}
+        with self._lock:
+            for key, _ in keys:
+                entry = self._lru.get(key)
+                if entry and entry[1] > now:
+                    self._lru.move_to_end(key)
+                    templates[key] = entry[0]
+
+        missing = list({key for key, _ in keys if key not in templates})
+        if missing:
+            for doc in self.collection.find(
+                {"_id": {"$in": missing}}, {"template": 1, "created_at": 1}
+            ):
+                templates[doc["_id"]] = doc["template"]
+                self._remember(doc["_id"], doc["template"], doc["created_at"])
+
+        results = []
+        with self._lock:
+            for (key, ordered), (_, _, score) in zip(keys, pairs):
+                template = templates.get(key)
+                if template is None:
+                    self.counters["misses"] += 1
+                    results.append(None)
+                    continue
+                self.counters["lru_hits" if key not in missing else "mongo_hits"] += 1
+                results.append(_fill(template, ordered, score))
+        return results
+
+    def put(self, user1: dict, user2: dict, score: int, description: str):
+        """
+        Store a freshly generated description under the pair's signature,
+        unless it can't be made free of the pair's names and score.
+        """
+        key, ordered = self.signature(user1, user2, score)
+        template = _strip(description, ordered, score)
+        if template is None:
+            with self._lock:
+                self.counters["uncacheable"] += 1
+            return
+        now = datetime.now(timezone.utc)
+        self.collection.update_one(
+            {"_id": key},
+            {"$set": {"template": template, "prompt_version": PROMPT_VERSION, "created_at": now}},
+            upsert=True,
+        )
+        self._remember(key, template, now)
+        with self._lock:
+            self.counters["stores"] += 1
+
+    def trim(self):
+        """Size-based eviction: drop the oldest docs beyond max_docs."""
+        excess = self.collection.estimated_document_count() - self.max_docs
+        if excess <= 0:
+            return 0
+        oldest = self.collection.find({}, {"_id": 1}).sort("created_at", ASCENDING).limit(excess)
+        ids = [doc["_id"] for doc in oldest]
+        return self.collection.delete_many({"_id": {"$in": ids}}).deleted_count
+
+    def _remember(self, key: str, template: str, created_at: datetime):
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        with self._lock:
+            self._lru[key] = (template, created_at + self.ttl)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+
+def _name_parts(user: dict) -> list:
+    """Words of a user's name (letters first, 2+ chars): "Mary-Jo O'Neil" -> both parts."""
+    words = re.findall(r"[^\W\d_][\w'-]*", user.get("name") or "")
+    return [word for word in words if len(word) > 1]
+
+
+def _has_word(text: str, word: str) -> bool:
+    return re.search(rf"(?<!\w){re.escape(word)}(?!\w)", text, re.IGNORECASE) is not None
+
+
+def _strip(description: str, ordered: tuple, score: int):
+    """
+    Replace the pair's full names, first names and exact score with
+    placeholders. Returns None when the text can't be made pair-neutral:
+    a name part or the score is still in it, the two people share a name
+    part, or a name doubles as a sign or hobby word (Leo, Sky...).
+    """
+    parts = [[p.lower() for p in _name_parts(user)] for user in ordered]
+    if set(parts[0]) & set(parts[1]):
+        return None
+    context = " ".join(
+        " ".join(str(v) for v in (user.get("zodiac") or {}).values() if v)
+        + " " + " ".join(user.get("hobbies") or [])
+        for user in ordered
+    )
+    if any(_has_word(context, part) for part in parts[0] + parts[1]):
+        return None
+
+    text = description.replace(f"{score}%", f"{_SCORE_TOKEN}%")
+    for user, token, first_token in zip(ordered, _NAME_TOKENS, _FIRST_NAME_TOKENS):
+        name = (user.get("name") or "").strip()
+        if name:
+            text = text.replace(name, token)
+        first = _name_parts(user)[:1]
+        if first:
+            text = re.sub(rf"(?<!\w){re.escape(first[0])}(?!\w)", first_token, text)
+
+    if any(_has_word(text, part) for part in parts[0] + parts[1]) or _has_word(text, str(score)):
+        return None
+    return text
+
+
+def _fill(template: str, ordered: tuple, score: int) -> str:
+    """Inverse of _strip for the pair being served."""
+    text = template.replace(_SCORE_TOKEN, str(score))
+    for user, token, first_token in zip(ordered, _NAME_TOKENS, _FIRST_NAME_TOKENS):
+        name = (user.get("name") or "").strip()
+        first = _name_parts(user)[:1]
+        text = text.replace(token, name or "your match")
+        text = text.replace(first_token, first[0] if first else name or "your match")
+    return text
@@ -0,0 +1,151 @@
+"""Matching job queue backed by a MongoDB collection."""
+
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app import mongo
+from app.models.job import create_job_doc
+
+MATCHING_JOB = "matching"
+
+
+def ensure_job_indexes():
+    """At most one queued/running job at a time, enforced by the database."""
+    mongo.db.jobs.create_index(
+        "active", unique=True, partialFilterExpression={"active": True}
+    )
+    mongo.db.jobs.create_index("created_at")
+
+
+def enqueue_matching_job(params: dict = None, stale_after: int = 600) -> tuple:
+    """
+    Queue a matching job. Returns (job, created); if a job is already queued
+    or running, returns that job with created=False instead.
+    """
+    ensure_job_indexes()
+    reap_stale_jobs(stale_after)
+
+    job = create_job_doc(MATCHING_JOB, params)
+    try:
+        job["_id"] = mongo.db.jobs.insert_one(job).inserted_id
+        return job, True
+    except DuplicateKeyError:
+        return mongo.db.jobs.find_one({"active": True}), False
+
+
+def get_job(job_id) -> dict:
+    return mongo.db.jobs.find_one({"_id": job_id})
+
+
+def claim_next_job() -> dict:
+    """Atomically move the queued job (if any) to running."""
+    now = datetime.now(timezone.utc)
+    return mongo.db.jobs.find_one_and_update(
+        {"status": "queued", "active": True},
+        {"$set": {"status": "running", "started_at": now, "heartbeat_at": now}},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def reap_stale_jobs(stale_after: int) -> int:
+    """Fail running jobs whose worker stopped heartbeating, freeing the slot."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_after)
+    result = mongo.db.jobs.update_many(
+        {"status": "running", "active": True, "heartbeat_at": {"$lt": cutoff}},
+        {
+            "$set": {
+                "status": "failed",
+                "error": "Worker stopped responding",
+                "finished_at": datetime.now(timezone.utc),
+            },
+            "$unset": {"active": ""},
+        },
+    )
+    return result.modified_count
+
+
+class _ProgressReporter:
+    """Writes phase, progress counts and per-phase timings onto the job doc."""
+
+    def __init__(self, job_id, min_interval: float = 1.0):
+        self.job_id = job_id
+        self.min_interval = min_interval
+        self.phase = None
+        self.phase_started = time.perf_counter()
+        self.last_write = 0.0
+        self.progress = {}
+        self.timings = {}
+
+    def __call__(self, phase: str, **counts):
+        now = time.perf_counter()
+        changed = phase != self.phase
+        if changed:
+            if self.phase is not None:
+                self.timings[self.phase] = round(now - self.phase_started, 3)
+            self.phase = phase
+            self.phase_started = now
+        self.progress.update(counts)
+
+        # Phase changes always land; in-phase counts are throttled
+        if changed or now - self.last_write >= self.min_interval:
+            self.flush()
+
+    def finish(self):
+        if self.phase is not None:
+            self.timings[self.phase] = round(time.perf_counter() - self.phase_started, 3)
+        self.phase = "done"
+
+    def flush(self, extra: dict = None):
+        self.last_write = time.perf_counter()
+        update = {
+            "phase": self.phase,
+            "progress": dict(self.progress),
+            "timings": dict(self.timings),
+            "heartbeat_at": datetime.now(timezone.utc),
+        }
+        update.update(extra or {})
+        mongo.db.jobs.update_one({"_id": self.job_id}, {"$set": update})
+
+
+def _heartbeat(job_id, stop: threading.Event, interval: float):
+    """Keep heartbeat_at fresh through long phases that report no progress."""
+    while not stop.wait(interval):
+        mongo.db.jobs.update_one(
+            {"_id": job_id}, {"$set": {"heartbeat_at": datetime.now(timezone.utc)}}
+        )
+
+
+def run_job(job: dict, heartbeat_interval: float = 30):
+    """Run a claimed job to completion and record its result or error."""
+    from app.services.matching import run_matching
+
+    reporter = _ProgressReporter(job["_id"])
+    params = job.get("params", {})
+    stop = threading.Event()
+    threading.Thread(
+        target=_heartbeat, args=(job["_id"], stop, heartbeat_interval), daemon=True
+    ).start()
+    try:
+        result = run_matching(
+            engine=params.get("engine"),
+            mode=params.get("mode"),
+            on_progress=reporter,
+        )
+        reporter.finish()
+        status = {"status": "succeeded", "result": result, "error": None}
+    except Exception as e:
+        print(f"Matching job {job['_id']} failed: {e}")
+        traceback.print_exc()
+        reporter.finish()
+        status = {"status": "failed", "error": str(e)}
+    finally:
+        stop.set()
+
+    status["finished_at"] = datetime.now(timezone.utc)
+    reporter.flush(status)
+    mongo.db.jobs.update_one({"_id": job["_id"]}, {"$unset": {"active": ""}})
@@ -1,7 +1,41 @@
 """LLM wrapper for generating cosmic compatibility descriptions."""
 
 import os
-from openai import OpenAI
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.metrics import LLM_DESCRIPTIONS, LLM_LATENCY
+
+# openai is imported on first use: it's slow to import and only the matching
+# job ever calls it, so web workers shouldn't pay for it at boot
+
+_SYSTEM_PROMPT = "You are a witty, Gen-Z campus astrologer who writes cosmic compatibility blurbs."
+_MODEL = "gpt-4o-mini"
+_MAX_TOKENS = 150
+
+_client = None
+_client_key = None
+_client_lock = threading.Lock()
+
+
+def _retryable_errors() -> tuple:
+    from openai import APIConnectionError, InternalServerError, RateLimitError
+    return (RateLimitError, APIConnectionError, InternalServerError)
+
+
+def _get_client(api_key: str, base_url: str = None):
+    """Return a shared OpenAI client, rebuilt only if the key/base URL change."""
+    from openai import OpenAI
+
+    global _client, _client_key
+    with _client_lock:
+        if _client is None or _client_key != (api_key, base_url):
+            # Retries are handled by _complete so they respect our rate limits
+            _client = OpenAI(api_key=api_key, base_url=base_url or None, max_retries=0)
+            _client_key = (api_key, base_url)
+        return _client
 
 
 def generate_cosmic_description(user1: dict, user2: dict, score: int) -> str:
@@ -11,16 +45,152 @@ def generate_cosmic_description(user1: dict, user2: dict, score: int) -> str:
     """
     api_key = os.getenv("OPENAI_API_KEY", "")
     if not api_key:
+        LLM_DESCRIPTIONS.labels("fallback").inc()
+        return _template_description(user1, user2, score)
+
+    client = _get_client(api_key, os.getenv("OPENAI_BASE_URL"))
+
+    try:
+        description = _complete(client, _build_prompt(user1, user2, score))
+    except Exception as e:
+        print(f"OpenAI API error: {e}")
+        LLM_DESCRIPTIONS.labels("fallback").inc()
         return _template_description(user1, user2, score)
+    LLM_DESCRIPTIONS.labels("llm").inc()
+    return description
 
-    client = OpenAI(api_key=api_key)
 
+def generate_cosmic_descriptions(
+    pairs: list,
+    max_concurrency: int = 8,
+    requests_per_minute: int = 500,
+    tokens_per_minute: int = 200000,
+    max_retries: int = 4,
+    stats: dict = None,
+    cache=None,
+    on_progress=None,
+) -> list:
+    """
+    Generate descriptions for many (user1, user2, score) pairs at once.
+    Reuses one client, runs up to max_concurrency requests in a thread pool,
+    stays under the RPM/TPM budget and retries transient errors with
+    exponential backoff. Pairs that still fail get _template_description.
+    With a DescriptionCache, cached pairs skip the LLM and fresh blurbs are stored.
+    Returns descriptions in the same order as pairs; fills stats if given.
+    on_progress(done, total) is called as descriptions complete.
+    """
+    if stats is None:
+        stats = {}
+    stats.update({"llm_requests": 0, "llm_retries": 0, "llm_fallbacks": 0})
+
+    api_key = os.getenv("OPENAI_API_KEY", "")
+    if not api_key:
+        stats["llm_fallbacks"] = len(pairs)
+        LLM_DESCRIPTIONS.labels("fallback").inc(len(pairs))
+        if on_progress is not None:
+            on_progress(len(pairs), len(pairs))
+        return [_template_description(u1, u2, score) for u1, u2, score in pairs]
+
+    client = _get_client(api_key, os.getenv("OPENAI_BASE_URL"))
+    retryable_errors = _retryable_errors()
+    request_limit = _RateLimiter(requests_per_minute)
+    token_limit = _RateLimiter(tokens_per_minute)
+    stats_lock = threading.Lock()
+
+    def count(key):
+        with stats_lock:
+            stats[key] += 1
+
+    def describe(pair):
+        user1, user2, score = pair
+        prompt = _build_prompt(user1, user2, score)
+        # Rough budget: ~4 characters per token, plus the completion cap
+        tokens = (len(_SYSTEM_PROMPT) + len(prompt)) // 4 + _MAX_TOKENS
+
+        for attempt in range(max_retries + 1):
+            request_limit.acquire(1)
+            token_limit.acquire(tokens)
+            count("llm_requests")
+            try:
+                description = _complete(client, prompt)
+            except retryable_errors as e:
+                if attempt == max_retries:
+                    print(f"OpenAI API error after {attempt + 1} attempts: {e}")
+                    break
+                count("llm_retries")
+                time.sleep(min(2 ** attempt, 30) * (0.5 + random.random()))
+            except Exception as e:
+                print(f"OpenAI API error: {e}")
+                break
+            else:
+                if cache is not None:
+                    try:
+                        cache.put(user1, user2, score, description)
+                    except Exception as e:
+                        print(f"Description cache write failed: {e}")
+                return description
+
+        count("llm_fallbacks")
+        return _template_description(user1, user2, score)
+
+    results = [None] * len(pairs)
+    if cache is not None:
+        try:
+            results = cache.get_many(pairs)
+        except Exception as e:
+            print(f"Description cache read failed: {e}")
+    todo = [idx for idx, text in enumerate(results) if text is None]
+    stats["llm_cache_hits"] = len(pairs) - len(todo)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        done = len(pairs) - len(todo)
+        for idx, description in zip(todo, pool.map(describe, [pairs[idx] for idx in todo])):
+            results[idx] = description
+            done += 1
+            if on_progress is not None:
+                on_progress(done, len(pairs))
+
+    LLM_DESCRIPTIONS.labels("cache").inc(stats["llm_cache_hits"])
+    LLM_DESCRIPTIONS.labels("llm").inc(len(todo) - stats["llm_fallbacks"])
+    LLM_DESCRIPTIONS.labels("fallback").inc(stats["llm_fallbacks"])
+    return results
+
+
+class _RateLimiter:
+    """Thread-safe token bucket holding at most one minute's budget."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = max(per_minute, 1)
+        self.rate = self.capacity / 60.0
+        self.available = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, amount: int):
+        """Block until `amount` units are available, then spend them."""
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.available = min(
+                    self.capacity, self.available + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.available >= amount:
+                    self.available -= amount
+                    return
+                wait = (amount - self.available) / self.rate
+            time.sleep(wait)
+
+
+def _build_prompt(user1: dict, user2: dict, score: int) -> str:
+    """Build the user prompt for a pair's compatibility blurb."""
     zodiac1 = user1.get("zodiac", {})
     zodiac2 = user2.get("zodiac", {})
     hobbies1 = ", ".join(user1.get("hobbies", []))
     hobbies2 = ", ".join(user2.get("hobbies", []))
 
-    prompt = f"""You are the goofy campus astrologer for Orbit, a Valentine's matching app at Rollins College.
+    return f"""You are the goofy campus astrologer for Orbit, a Valentine's matching app at Rollins College.
 Write a fun, playful, Gen-Z-friendly 2-3 sentence cosmic compatibility blurb for these two people.
 
 Person 1: {user1.get('name', 'Star Child 1')}
@@ -41,20 +211,25 @@ Rules:
 - Do NOT use generic dating app language. Be creative and cosmic.
 - Keep it under 60 words."""
 
+
+def _complete(client, prompt: str) -> str:
+    """Send one chat completion request and return the blurb text."""
+    started = time.perf_counter()
     try:
         response = client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=_MODEL,
             messages=[
-                {"role": "system", "content": "You are a witty, Gen-Z campus astrologer who writes cosmic compatibility blurbs."},
+                {"role": "system", "content": _SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
             ],
-            max_tokens=150,
+            max_tokens=_MAX_TOKENS,
             temperature=0.9,
         )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        print(f"OpenAI API error: {e}")
-        return _template_description(user1, user2, score)
+    except Exception:
+        LLM_LATENCY.labels("error").observe(time.perf_counter() - started)
+        raise
+    LLM_LATENCY.labels("success").observe(time.perf_counter() - started)
+    return response.choices[0].message.content.strip()
 
 
 def _template_description(user1: dict, user2: dict, score: int) -> str:
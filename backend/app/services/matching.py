@@ -1,16 +1,37 @@
 """Matching algorithm: pairs users based on zodiac + hobbies + intent."""
 
+import time
+from datetime import datetime, timezone
+from itertools import combinations, product
 from bson.objectid import ObjectId
+from flask import current_app
 from app import mongo
+from app.indexes import MATCH_INDEXES
 from app.utils.zodiac_compat import get_compatibility
-from app.models.match import create_match_doc
-from app.services.llm import generate_cosmic_description
+from app.utils.hobbies import HobbyVocabulary, hobby_overlap
+from app.models.match import create_match_doc, PARTNER_PROJECTION
+from app.services.llm import generate_cosmic_descriptions
+from app.services.reveal import materialize_reveal_payloads
 
+MATCHES_STAGING = "matches_staging"
 
-def calculate_pair_score(user1: dict, user2: dict) -> tuple:
+# What scoring, the LLM prompt and the reveal payloads read from each user
+MATCHING_USER_PROJECTION = {
+    **PARTNER_PROJECTION,
+    "looking_for": 1,
+    "gender": 1,
+    "interested_in": 1,
+}
+
+# Process-wide so its in-memory LRU survives between matching runs
+_DESCRIPTION_CACHE = None
+
+
+def calculate_pair_score(user1: dict, user2: dict, hobby_masks: tuple = None) -> tuple:
     """
     Calculate compatibility score between two users.
     Returns (total_score, breakdown_dict).
+    hobby_masks: optional precomputed (mask1, mask2) from a shared HobbyVocabulary.
     """
     zodiac1 = user1.get("zodiac", {})
     zodiac2 = user2.get("zodiac", {})
@@ -31,10 +52,16 @@ def calculate_pair_score(user1: dict, user2: dict) -> tuple:
     weighted_moon = moon_score * 0.25
 
     # 3. Hobby overlap (20% weight)
-    hobbies1 = set(user1.get("hobbies", []))
-    hobbies2 = set(user2.get("hobbies", []))
-    common_hobbies = len(hobbies1 & hobbies2)
-    hobby_score = min(common_hobbies / 3 * 100, 100) if hobbies1 or hobbies2 else 50
+    if hobby_masks is not None:
+        mask1, mask2 = hobby_masks
+        common_hobbies = hobby_overlap(mask1, mask2)
+        any_hobbies = bool(mask1 or mask2)
+    else:
+        hobbies1 = set(user1.get("hobbies", []))
+        hobbies2 = set(user2.get("hobbies", []))
+        common_hobbies = len(hobbies1 & hobbies2)
+        any_hobbies = bool(hobbies1 or hobbies2)
+    hobby_score = min(common_hobbies / 3 * 100, 100) if any_hobbies else 50
     weighted_hobby = hobby_score * 0.20
 
     # 4. Looking-for alignment (15% weight)
@@ -66,83 +93,436 @@ def _intent_compatibility(lf1: str, lf2: str) -> int:
     return 40
 
 
-def run_matching() -> dict:
+def run_matching(engine: str = None, mode: str = None, on_progress=None) -> dict:
     """
     Run the matching algorithm for all onboarded users.
     Each user gets their single best cosmic Valentine match.
-    Uses a greedy approach: pair highest-scoring pairs first.
+
+    engine selects the pair scorer: "python" (reference) or "numpy".
+    mode selects the assignment: "greedy" pairs highest-scoring pairs first;
+    "optimal" runs maximum-weight matching over each user's top-K candidates
+    and reports how it compares with the greedy result. Blossom doesn't scale,
+    so above MATCHING_OPTIMAL_MAX_USERS optimal falls back to greedy.
+    Both default to the MATCHING_ENGINE / MATCHING_MODE config values.
+    on_progress(phase, **counts) is called as the run moves through phases.
     """
+    if on_progress is None:
+        on_progress = lambda phase, **counts: None
+    if engine is None:
+        engine = current_app.config.get("MATCHING_ENGINE", "python")
+    if mode is None:
+        mode = current_app.config.get("MATCHING_MODE", "greedy")
+
+    # Taken before reading users so edits made during this run count as
+    # changed on the next incremental run
+    run_started_at = datetime.now(timezone.utc)
+
     # Get all onboarded users
-    users = list(mongo.db.users.find({"onboarding_complete": True}))
+    on_progress("loading")
+    # In _id order so ties break the same way from run to run
+    users = list(
+        mongo.db.users.find({"onboarding_complete": True}, MATCHING_USER_PROJECTION).sort("_id", 1)
+    )
 
     if len(users) < 2:
         return {"matches_created": 0, "users_matched": 0}
 
-    # Clear existing matches
-    mongo.db.matches.delete_many({})
+    incremental = engine == "numpy" and current_app.config.get("MATCHING_INCREMENTAL", False)
+    stats = {
+        "engine": engine,
+        "mode": mode,
+        "incremental": incremental,
+        "scoring_workers": _scoring_workers() if engine == "numpy" else 1,
+    }
 
-    # Calculate all pair scores
-    pair_scores = []
-    for i in range(len(users)):
-        for j in range(i + 1, len(users)):
-            u1, u2 = users[i], users[j]
+    # Only pairs from gender/interest-compatible buckets ever get scored
+    blocks = _block_users(users)
+    stats.update({
+        "buckets": len(blocks["members"]),
+        "pairs_scored": blocks["pairs_scored"],
+        "pairs_pruned": blocks["pairs_pruned"],
+    })
+
+    # Score compatible pairs, best first
+    on_progress("scoring", users=len(users), pairs_to_score=blocks["pairs_scored"])
+    started = time.perf_counter()
+    top_k = current_app.config.get("MATCHING_TOP_K", 20)
+    greedy_numpy = None
+    if engine == "numpy":
+        if incremental:
+            greedy_numpy, ranked = _incremental_candidates(users, blocks, top_k, run_started_at, stats)
+        else:
+            greedy_numpy, ranked = _greedy_candidates(users, blocks, top_k)
+        get_breakdown = lambda i, j: calculate_pair_score(users[i], users[j])[1]
+    else:
+        ranked, get_breakdown = _rank_pairs_python(users, blocks)
+    stats["scoring_seconds"] = round(time.perf_counter() - started, 3)
+
+    # Assign each user at most one partner
+    on_progress("assigning", candidate_pairs=_ranked_len(ranked))
+    started = time.perf_counter()
+    if greedy_numpy is not None:
+        greedy = greedy_numpy.select(*ranked)
+        stats["candidate_refills"] = greedy_numpy.refills
+    else:
+        greedy = _select_greedy(_iter_ranked(ranked))
+    greedy_seconds = round(time.perf_counter() - started, 3)
+
+    if mode == "optimal" and _optimal_fits(len(users), stats):
+        candidates = _candidate_graph(ranked, len(users), top_k, directed=greedy_numpy is not None)
+        stats["top_k"] = top_k
+        stats["candidate_edges"] = len(candidates)
+
+        started = time.perf_counter()
+        selected = _select_optimal(candidates)
+        stats["assignment_seconds"] = round(time.perf_counter() - started, 3)
+        stats["greedy_seconds"] = greedy_seconds
+        stats.update(_score_summary(greedy, "greedy_"))
+    else:
+        selected = greedy
+        stats["assignment_seconds"] = greedy_seconds
+    stats.update(_score_summary(selected))
+
+    # Generate LLM cosmic descriptions for every selected pair in one batch
+    started = time.perf_counter()
+    pairs = [(users[i], users[j], score) for score, i, j in selected]
+    on_progress("describing", matches=len(pairs), described=0)
+    cache = _description_cache()
+    try:
+        descriptions = generate_cosmic_descriptions(
+            pairs,
+            max_concurrency=current_app.config.get("LLM_MAX_CONCURRENCY", 8),
+            requests_per_minute=current_app.config.get("LLM_REQUESTS_PER_MINUTE", 500),
+            tokens_per_minute=current_app.config.get("LLM_TOKENS_PER_MINUTE", 200000),
+            max_retries=current_app.config.get("LLM_MAX_RETRIES", 4),
+            stats=stats,
+            cache=cache,
+            on_progress=lambda done, total: on_progress("describing", described=done),
+        )
+    except Exception as e:
+        print(f"LLM description failed: {e}")
+        descriptions = [_fallback_description(u1, u2, score) for u1, u2, score in pairs]
+    stats["llm_seconds"] = round(time.perf_counter() - started, 3)
+    if cache is not None:
+        stats["description_cache"] = dict(cache.counters)
+        cache.trim()
+
+    match_docs = []
+    matched_ids = set()
+    for (score, i, j), description in zip(selected, descriptions):
+        u1, u2 = users[i], users[j]
+        match_docs.append(create_match_doc(
+            user1_id=u1["_id"],
+            user2_id=u2["_id"],
+            compatibility_score=score,
+            astro_breakdown=get_breakdown(i, j),
+            cosmic_description=description,
+            match_type="valentine",
+        ))
+        matched_ids.add(u1["_id"])
+        matched_ids.add(u2["_id"])
+
+    # Readers keep seeing the previous match set until the swap
+    on_progress("writing", matches=len(match_docs))
+    stats.update(_replace_matches(
+        match_docs, current_app.config.get("MATCH_WRITE_BATCH_SIZE", 1000)
+    ))
+
+    # Ready-to-serve /matches/me bodies for every matched user
+    stats.update(materialize_reveal_payloads(
+        match_docs,
+        {u["_id"]: u for u in users},
+        current_app.config.get("MATCH_WRITE_BATCH_SIZE", 1000),
+    ))
 
-            # Basic gender/interest filtering
-            if not _gender_compatible(u1, u2):
-                continue
+    return {
+        "matches_created": len(match_docs),
+        "users_matched": len(matched_ids),
+        "stats": stats,
+    }
 
-            score, breakdown = calculate_pair_score(u1, u2)
-            pair_scores.append({
-                "user1": u1,
-                "user2": u2,
-                "score": score,
-                "breakdown": breakdown,
-            })
 
-    # Sort by score descending
-    pair_scores.sort(key=lambda x: x["score"], reverse=True)
+def _replace_matches(match_docs: list, batch_size: int) -> dict:
+    """
+    Write the new match set into a staging collection in insert_many batches,
+    build its indexes, then rename it over `matches` in one atomic step.
+    Returns write/swap timings.
+    """
+    staging = mongo.db[MATCHES_STAGING]
+    staging.drop()
 
-    # Greedy matching: pair highest scores first, each user matched once
-    matched_ids = set()
-    matches_created = 0
+    started = time.perf_counter()
+    for start in range(0, len(match_docs), batch_size):
+        staging.insert_many(match_docs[start:start + batch_size], ordered=False)
+    staging.create_indexes(MATCH_INDEXES)
+    write_seconds = time.perf_counter() - started
 
-    for pair in pair_scores:
-        u1_id = pair["user1"]["_id"]
-        u2_id = pair["user2"]["_id"]
+    started = time.perf_counter()
+    staging.rename("matches", dropTarget=True)
+    swap_seconds = time.perf_counter() - started
 
-        if u1_id in matched_ids or u2_id in matched_ids:
+    return {
+        "write_seconds": round(write_seconds, 3),
+        "write_docs_per_second": round(len(match_docs) / write_seconds) if write_seconds else 0,
+        "swap_seconds": round(swap_seconds, 4),
+    }
+
+
+def _description_cache():
+    """Build the description cache from config, or None when disabled."""
+    global _DESCRIPTION_CACHE
+    if not current_app.config.get("DESCRIPTION_CACHE_ENABLED", True):
+        return None
+    if _DESCRIPTION_CACHE is None:
+        from app.services.description_cache import DescriptionCache
+
+        _DESCRIPTION_CACHE = DescriptionCache(
+            lru_size=current_app.config.get("DESCRIPTION_CACHE_LRU_SIZE", 2048),
+            ttl_days=current_app.config.get("DESCRIPTION_CACHE_TTL_DAYS", 30),
+            max_docs=current_app.config.get("DESCRIPTION_CACHE_MAX_DOCS", 50000),
+            score_bucket=current_app.config.get("DESCRIPTION_CACHE_SCORE_BUCKET", 5),
+        )
+        _DESCRIPTION_CACHE.ensure_indexes()
+    _DESCRIPTION_CACHE.reset_counters()
+    return _DESCRIPTION_CACHE
+
+
+def _iter_ranked(ranked, chunk: int = 65536):
+    """
+    Iterate (score, i, j) from a best-first list or from best-first
+    (scores, lo, hi) arrays, converting the arrays a chunk at a time.
+    """
+    if isinstance(ranked, list):
+        yield from ranked
+        return
+    scores, lo, hi = ranked
+    for start in range(0, len(scores), chunk):
+        end = start + chunk
+        yield from zip(scores[start:end].tolist(), lo[start:end].tolist(), hi[start:end].tolist())
+
+
+def _ranked_len(ranked) -> int:
+    return len(ranked) if isinstance(ranked, list) else len(ranked[0])
+
+
+def _select_greedy(ranked) -> list:
+    """Greedy matching: take pairs best first, each user matched once."""
+    matched = set()
+    selected = []
+    for score, i, j in ranked:
+        if i in matched or j in matched:
             continue
+        matched.add(i)
+        matched.add(j)
+        selected.append((score, i, j))
+    return selected
+
+
+def _select_optimal(ranked) -> list:
+    """
+    Maximum-weight matching (Edmonds' blossom) over the candidate edges.
+    Scores are all positive, so the result is also a maximal matching.
+    """
+    import networkx as nx
+
+    graph = nx.Graph()
+    graph.add_weighted_edges_from((i, j, score) for score, i, j in ranked)
+    weights = {(i, j): score for score, i, j in ranked}
+
+    selected = []
+    for u, v in nx.max_weight_matching(graph):
+        i, j = min(u, v), max(u, v)
+        selected.append((weights[(i, j)], i, j))
+    selected.sort(key=lambda x: (-x[0], x[1], x[2]))
+    return selected
+
+
+def _score_summary(selected: list, prefix: str = "") -> dict:
+    """Total and mean compatibility of a set of selected pairs."""
+    total = sum(score for score, _, _ in selected)
+    return {
+        f"{prefix}pairs": len(selected),
+        f"{prefix}total_score": total,
+        f"{prefix}mean_score": round(total / len(selected), 2) if selected else 0,
+    }
+
+
+def _optimal_fits(n: int, stats: dict) -> bool:
+    """Whether blossom matching is affordable for n users; records why not."""
+    max_users = current_app.config.get("MATCHING_OPTIMAL_MAX_USERS", 2000)
+    if n <= max_users:
+        return True
+    print(f"Optimal matching skipped: {n} users > MATCHING_OPTIMAL_MAX_USERS={max_users}, using greedy")
+    stats["optimal_skipped"] = f"{n} users > {max_users}"
+    return False
+
+
+def _candidate_graph(ranked, n: int, k: int, directed: bool) -> list:
+    """
+    Sparse candidate graph: every compatible pair that is in the top-K of
+    at least one of its two users. ranked is either the directed per-user
+    top-K edges (directed=True) or a full best-first ranking.
+    Returns [(score, i, j), ...] best first.
+    """
+    if directed:
+        from app.services.scoring import merge_edges
+
+        lo, hi, scores = merge_edges([ranked], n)
+        return list(zip(scores.tolist(), lo.tolist(), hi.tolist()))
+    return _top_k_from_ranked(_iter_ranked(ranked), n, k)
+
+
+def _top_k_from_ranked(ranked, n: int, k: int) -> list:
+    """Keep the pairs of a best-first list that are in either user's top-K."""
+    counts = [0] * n
+    candidates = []
+    for score, i, j in ranked:
+        if counts[i] < k or counts[j] < k:
+            candidates.append((score, i, j))
+        counts[i] += 1
+        counts[j] += 1
+    return candidates
+
 
-        # Generate LLM cosmic description
-        try:
-            description = generate_cosmic_description(
-                pair["user1"], pair["user2"], pair["score"]
+def _incremental_candidates(users: list, blocks: dict, k: int, run_started_at, stats: dict) -> tuple:
+    """
+    _greedy_candidates, but starting from the candidate lists persisted by
+    the last run: only users that are new or whose updated_at is newer than
+    that run get rescored (plus the few whose lists they fell out of).
+    Persists the updated lists for the next run.
+    """
+    import numpy as np
+
+    from app.services import pair_cache
+    from app.services.assignment import CandidateGreedy
+    from app.services.scoring import encode_users
+
+    snapshot = pair_cache.load_snapshot(k)
+    if snapshot is None:
+        greedy, edges = _greedy_candidates(users, blocks, k)
+        stats.update({"users_changed": len(users), "rows_rescored": len(users), "candidates_reused": 0})
+    else:
+        changed_ids = {
+            doc["_id"] for doc in mongo.db.users.find(
+                {"onboarding_complete": True, "updated_at": {"$gt": snapshot["run_started_at"]}},
+                {"_id": 1},
             )
-        except Exception as e:
-            print(f"LLM description failed: {e}")
-            description = _fallback_description(pair["user1"], pair["user2"], pair["score"])
-
-        # Create match document
-        match_doc = create_match_doc(
-            user1_id=u1_id,
-            user2_id=u2_id,
-            compatibility_score=pair["score"],
-            astro_breakdown=pair["breakdown"],
-            cosmic_description=description,
-            match_type="valentine",
-        )
-        mongo.db.matches.insert_one(match_doc)
+        }
+        known_ids = set(snapshot["user_ids"])
+        dirty = np.array([u["_id"] in changed_ids or u["_id"] not in known_ids for u in users])
+        enc = encode_users(users)
+        edges, counts = pair_cache.update_candidates(enc, blocks, users, snapshot, dirty, k)
+        greedy = CandidateGreedy(enc, blocks, k)
+        stats.update(counts)
+
+    pair_cache.save_snapshot(users, edges, k, run_started_at)
+    return greedy, edges
+
+
+def _bucket_key(user: dict) -> tuple:
+    """Everything _gender_compatible reads, plus intent."""
+    return (
+        user.get("gender"),
+        frozenset(user.get("interested_in") or []),
+        user.get("looking_for", "both"),
+    )
 
-        matched_ids.add(u1_id)
-        matched_ids.add(u2_id)
-        matches_created += 1
 
+def _block_users(users: list) -> dict:
+    """
+    Group users into (gender, interested_in, looking_for) buckets and build a
+    bucket-to-bucket compatibility table, so incompatible pairs are pruned
+    before they are ever enumerated.
+    """
+    buckets = {}
+    for i, user in enumerate(users):
+        buckets.setdefault(_bucket_key(user), []).append(i)
+    members = list(buckets.values())
+
+    # Compatibility only depends on the bucket key, so one representative
+    # per bucket is enough
+    neighbors = [[] for _ in members]
+    bucket_pairs = []
+    pairs_scored = 0
+    for a in range(len(members)):
+        for b in range(a, len(members)):
+            if not _gender_compatible(users[members[a][0]], users[members[b][0]]):
+                continue
+            neighbors[a].append(b)
+            if a != b:
+                neighbors[b].append(a)
+            bucket_pairs.append((a, b))
+            size_a, size_b = len(members[a]), len(members[b])
+            pairs_scored += size_a * (size_a - 1) // 2 if a == b else size_a * size_b
+
+    n = len(users)
     return {
-        "matches_created": matches_created,
-        "users_matched": len(matched_ids),
+        "members": members,
+        "neighbors": neighbors,
+        "bucket_pairs": bucket_pairs,
+        "pairs_scored": pairs_scored,
+        "pairs_pruned": n * (n - 1) // 2 - pairs_scored,
     }
 
 
+def _block_pairs(blocks: dict):
+    """Yield every (i, j), i < j, from compatible bucket pairs."""
+    members = blocks["members"]
+    for a, b in blocks["bucket_pairs"]:
+        if a == b:
+            pairs = combinations(members[a], 2)
+        else:
+            pairs = product(members[a], members[b])
+        for i, j in pairs:
+            yield (i, j) if i < j else (j, i)
+
+
+def _rank_pairs_python(users: list, blocks: dict) -> tuple:
+    """
+    Reference scorer: calls calculate_pair_score for every compatible pair.
+    Returns ([(score, i, j), ...] sorted best first, breakdown lookup).
+    """
+    vocab = HobbyVocabulary()
+    masks = [vocab.mask(u.get("hobbies", [])) for u in users]
+
+    ranked = []
+    breakdowns = {}
+    for i, j in _block_pairs(blocks):
+        score, breakdown = calculate_pair_score(users[i], users[j], (masks[i], masks[j]))
+        ranked.append((score, i, j))
+        breakdowns[(i, j)] = breakdown
+
+    # Sort by score descending; ties keep user enumeration order
+    ranked.sort(key=lambda x: (-x[0], x[1], x[2]))
+    return ranked, lambda i, j: breakdowns[(i, j)]
+
+
+def _greedy_candidates(users: list, blocks: dict, k: int) -> tuple:
+    """
+    Vectorized scorer for greedy mode: each user's K best partners, scored
+    in row shards across MATCHING_WORKERS processes. Returns a CandidateGreedy
+    (which gives the same pairs as greedy over _rank_pairs_python's full list)
+    and the directed (rows, cols, scores) candidate edges it selects from.
+    Breakdowns are only materialized for the pairs that get matched.
+    """
+    from app.services.assignment import CandidateGreedy
+    from app.services.scoring import encode_users
+    from app.services.sharding import build_shards, score_shards
+
+    enc = encode_users(users)
+    shards = build_shards(blocks, _shard_rows(), top_k=True)
+    edges = score_shards(enc, shards, k, _scoring_workers(), merge=False)
+    return CandidateGreedy(enc, blocks, k), edges
+
+
+def _scoring_workers() -> int:
+    return current_app.config.get("MATCHING_WORKERS", 1)
+
+
+def _shard_rows() -> int:
+    return current_app.config.get("MATCHING_SHARD_ROWS", 512)
+
+
 def _gender_compatible(u1: dict, u2: dict) -> bool:
     """Check if two users are compatible based on gender preferences."""
     g1 = u1.get("gender")
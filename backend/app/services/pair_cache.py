@@ -0,0 +1,130 @@
+"""Persisted per-user top-K candidates for incremental rescoring between matching runs."""
+
+import io
+
+import gridfs
+import numpy as np
+from bson.objectid import ObjectId
+
+from app import mongo
+from app.services.scoring import shard_edges
+
+SNAPSHOT_FILENAME = "pair_candidates"
+# The all-pairs snapshot older versions kept; removed on the next save
+_LEGACY_FILENAME = "pair_scores"
+
+
+def load_snapshot(k: int) -> dict:
+    """
+    Latest candidate snapshot, or None if there isn't one for this K
+    (a different MATCHING_TOP_K needs a full rescore).
+    """
+    fs = gridfs.GridFS(mongo.db)
+    try:
+        grid_out = fs.get_last_version(SNAPSHOT_FILENAME)
+    except gridfs.NoFile:
+        return None
+    if grid_out.metadata.get("k") != k:
+        return None
+    arrays = np.load(io.BytesIO(grid_out.read()))
+    snapshot = {key: arrays[key] for key in arrays.files}
+    snapshot["user_ids"] = [ObjectId(row.tobytes()) for row in snapshot["user_ids"]]
+    snapshot["run_started_at"] = grid_out.metadata["run_started_at"]
+    return snapshot
+
+
+def save_snapshot(users: list, edges: tuple, k: int, run_started_at):
+    """
+    Replace the stored snapshot with this run's candidate lists: n * K edges,
+    a few bytes each, so it's written uncompressed.
+    """
+    rows, cols, scores = edges
+    buf = io.BytesIO()
+    np.savez(
+        buf,
+        user_ids=np.frombuffer(
+            b"".join(u["_id"].binary for u in users), dtype=np.uint8
+        ).reshape(-1, 12),
+        rows=rows.astype(np.int32),
+        cols=cols.astype(np.int32),
+        scores=scores.astype(np.uint8),
+    )
+    fs = gridfs.GridFS(mongo.db)
+    new_id = fs.put(
+        buf.getvalue(),
+        filename=SNAPSHOT_FILENAME,
+        metadata={"run_started_at": run_started_at, "users": len(users), "k": k},
+    )
+    for old in fs.find({"filename": {"$in": [SNAPSHOT_FILENAME, _LEGACY_FILENAME]},
+                        "_id": {"$ne": new_id}}):
+        fs.delete(old._id)
+
+
+def top_k_per_row(rows, cols, scores, n: int, k: int) -> tuple:
+    """Each row's k best edges (score desc, then partner index)."""
+    order = np.lexsort(((100 - scores) * n + cols, rows))
+    rows, cols, scores = rows[order], cols[order], scores[order]
+    rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+    keep = rank < k
+    return rows[keep], cols[keep], scores[keep]
+
+
+def update_candidates(enc: dict, blocks: dict, users: list, snapshot: dict,
+                      dirty: np.ndarray, k: int) -> tuple:
+    """
+    Bring the snapshot's candidate lists up to date for the current users.
+    dirty flags users that are new or changed since the snapshot.
+
+    A clean user's old list is still an exact prefix of their ranking among
+    clean partners (users are ordered by _id, so ties break the same way);
+    merging in their fresh scores against every dirty user keeps it exact.
+    Only a full list (K entries, so not every partner) that lost a dirty or
+    departed partner has to be rescored. Scores are symmetric, so the dirty
+    users' rows give their columns too.
+    Returns directed (rows, cols, scores) for CandidateGreedy and counts.
+    """
+    n = enc["n"]
+    index = {u["_id"]: i for i, u in enumerate(users)}
+    remap = np.array([index.get(uid, -1) for uid in snapshot["user_ids"]], dtype=np.int64)
+    present = remap >= 0
+    remap[present] = np.where(dirty[remap[present]], -1, remap[present])
+    old_rows, old_cols = remap[snapshot["rows"]], remap[snapshot["cols"]]
+    old_scores = snapshot["scores"].astype(np.int64)
+
+    # Full lists that lost a partner can't be patched: the partner that
+    # should take its place is unknown
+    alive = old_rows >= 0
+    full = np.bincount(old_rows[alive], minlength=n) >= k
+    lost = alive & (old_cols < 0)
+    rescore = dirty.copy()
+    rescore[old_rows[lost & full[np.maximum(old_rows, 0)]]] = True
+
+    keep = alive & (old_cols >= 0)
+    keep[keep] = ~rescore[old_rows[keep]]
+    parts = [(old_rows[keep], old_cols[keep], old_scores[keep])]
+    fresh = []
+
+    members = [np.array(m, dtype=np.int64) for m in blocks["members"]]
+    for a, neighbors in enumerate(blocks["neighbors"]):
+        if not neighbors:
+            continue
+        pool = np.concatenate([members[b] for b in neighbors])
+        dirty_rows = members[a][dirty[members[a]]]
+        if len(dirty_rows):
+            rows, cols, scores = shard_edges(enc, dirty_rows, pool)
+            fresh.append(top_k_per_row(rows, cols, scores, n, k))
+            # The same scores seen from the clean partners' side
+            into_clean = ~rescore[cols]
+            parts.append((cols[into_clean], rows[into_clean], scores[into_clean]))
+        other_rows = members[a][rescore[members[a]] & ~dirty[members[a]]]
+        if len(other_rows):
+            fresh.append(shard_edges(enc, other_rows, pool, k))
+
+    rows, cols, scores = (np.concatenate([p[i] for p in parts]) for i in range(3))
+    patched = top_k_per_row(rows, cols, scores, n, k)
+    edges = tuple(np.concatenate([patched[i]] + [f[i] for f in fresh]) for i in range(3))
+    return edges, {
+        "users_changed": int(dirty.sum()),
+        "rows_rescored": int(rescore.sum()),
+        "candidates_reused": int(keep.sum()),
+    }
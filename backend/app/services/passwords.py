@@ -0,0 +1,55 @@
+"""Password hashing on a small bounded thread pool, so bcrypt can't starve the web workers."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from flask import current_app
+
+
+class HashingBusy(Exception):
+    """The hashing pool is saturated (or too slow); the caller should answer 503."""
+
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+def _pool() -> tuple:
+    """(executor, slots) built once from config. Slots bound running + queued hashes."""
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            workers = current_app.config.get("BCRYPT_WORKERS", 2)
+            queue_depth = current_app.config.get("BCRYPT_QUEUE_DEPTH", 8)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+            _slots = threading.BoundedSemaphore(workers + queue_depth)
+        return _executor, _slots
+
+
+def _run(fn, *args):
+    executor, slots = _pool()
+    if not slots.acquire(blocking=False):
+        raise HashingBusy("Password hashing queue is full")
+    try:
+        future = executor.submit(fn, *args)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result(timeout=current_app.config.get("BCRYPT_TIMEOUT_SECONDS", 5))
+    except TimeoutError:
+        raise HashingBusy("Password hashing timed out")
+
+
+def _hash(password: bytes, rounds: int) -> bytes:
+    import bcrypt
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def hash_password(password: str) -> str:
+    """bcrypt hash at BCRYPT_ROUNDS. Raises HashingBusy when the pool is saturated."""
+    rounds = current_app.config.get("BCRYPT_ROUNDS", 12)
+    return _run(_hash, password.encode("utf-8"), rounds).decode("utf-8")
+
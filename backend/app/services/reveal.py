@@ -0,0 +1,155 @@
+"""Precomputed /matches/me payloads for the reveal-night thundering herd."""
+
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from bson.objectid import ObjectId
+from flask import current_app
+
+from app import mongo
+from app.models.match import serialize_match, MATCH_PROJECTION, PARTNER_PROJECTION
+from app.utils.cache import TTLCache
+
+PAYLOADS = "reveal_payloads"
+PAYLOADS_STAGING = "reveal_payloads_staging"
+
+# user ObjectId -> (teaser_json, revealed_json, force_revealed)
+_payload_cache = TTLCache(maxsize=20000, ttl=30)
+
+
+@lru_cache(maxsize=8)
+def _parse_reveal_date(reveal_date_str: str) -> datetime:
+    return datetime.fromisoformat(reveal_date_str).replace(tzinfo=timezone.utc)
+
+
+def reveal_date() -> datetime:
+    """MATCH_REVEAL_DATE as an aware datetime, parsed once per value."""
+    return _parse_reveal_date(current_app.config.get("MATCH_REVEAL_DATE", "2026-02-13T20:00:00"))
+
+
+def teaser_body(match: dict, reveal_date_str: str) -> dict:
+    """/matches/me body before the reveal: no partner details."""
+    return {
+        "match": {
+            "id": str(match["_id"]),
+            "compatibility_score": match.get("compatibility_score", 0),
+            "match_type": match.get("match_type", "valentine"),
+            "revealed": False,
+            "reveal_date": reveal_date_str,
+        },
+        "status": "countdown",
+        "message": "Your cosmic match will be revealed on Valentine's Eve!",
+    }
+
+
+def revealed_body(match: dict, partner: dict) -> dict:
+    """/matches/me body after the reveal."""
+    match = dict(match, revealed=True)
+    return {
+        "match": serialize_match(match, partner),
+        "status": "revealed",
+        "message": "The stars have aligned!",
+    }
+
+
+def materialize_reveal_payloads(match_docs: list, users_by_id: dict, batch_size: int = 1000) -> dict:
+    """
+    Build both /matches/me variants for every matched user, write them to a
+    staging collection keyed by user id and swap it in with a rename.
+    """
+    started = time.perf_counter()
+    reveal_date_str = current_app.config.get("MATCH_REVEAL_DATE", "2026-02-13T20:00:00")
+    dumps = current_app.json.dumps
+
+    docs = []
+    for match in match_docs:
+        for user_id, partner_id in (
+            (match["user1_id"], match["user2_id"]),
+            (match["user2_id"], match["user1_id"]),
+        ):
+            partner = users_by_id.get(partner_id) or {}
+            partner = {field: partner.get(field) for field in PARTNER_PROJECTION if field in partner}
+            docs.append({
+                "_id": user_id,
+                "match_id": match["_id"],
+                "teaser": dumps(teaser_body(match, reveal_date_str)),
+                "revealed": dumps(revealed_body(match, partner)),
+                "force_revealed": bool(match.get("revealed")),
+            })
+
+    staging = mongo.db[PAYLOADS_STAGING]
+    staging.drop()
+    for start in range(0, len(docs), batch_size):
+        staging.insert_many(docs[start:start + batch_size], ordered=False)
+    if not docs:
+        mongo.db.create_collection(PAYLOADS_STAGING)
+    staging.rename(PAYLOADS, dropTarget=True)
+    _payload_cache.clear()
+
+    return {
+        "reveal_payloads": len(docs),
+        "reveal_payload_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def refresh_partner_payloads(user_ids: list) -> int:
+    """
+    Rebuild the revealed payload of everyone matched with user_ids after
+    those users changed their profile: payloads embed the partner's name,
+    contacts and signs. Other processes' cached copies expire with the
+    payload cache TTL. Returns how many payloads were rewritten.
+    """
+    user_ids = [ObjectId(user_id) for user_id in user_ids]
+    matches = list(mongo.db.matches.find({"participants": {"$in": user_ids}}, MATCH_PROJECTION))
+    if not matches:
+        return 0
+
+    edited = set(user_ids)
+    profiles = {u["_id"]: u for u in mongo.db.users.find({"_id": {"$in": user_ids}}, PARTNER_PROJECTION)}
+    dumps = current_app.json.dumps
+    refreshed = 0
+    for match in matches:
+        for user_id, partner_id in (
+            (match["user1_id"], match["user2_id"]),
+            (match["user2_id"], match["user1_id"]),
+        ):
+            if partner_id not in edited:
+                continue
+            # One match per user, so this is one write per edited user
+            refreshed += mongo.db[PAYLOADS].update_one(
+                {"_id": user_id, "match_id": match["_id"]},
+                {"$set": {"revealed": dumps(revealed_body(match, profiles.get(partner_id)))}},
+            ).modified_count
+            _payload_cache.delete(user_id)
+    return refreshed
+
+
+def get_reveal_payload(user_oid):
+    """Cached (teaser_json, revealed_json, force_revealed) for a user, or None."""
+    payload = _payload_cache.get(user_oid)
+    if payload is not None:
+        return payload
+
+    doc = mongo.db[PAYLOADS].find_one({"_id": user_oid})
+    if not doc:
+        return None
+    payload = (doc["teaser"], doc["revealed"], doc.get("force_revealed", False))
+    _payload_cache.set(user_oid, payload)
+    return payload
+
+
+def register_commands(app):
+    """`flask materialize-reveal`: rebuild payloads from the current matches."""
+    import click
+
+    @app.cli.command("materialize-reveal")
+    def materialize_reveal_command():
+        matches = list(mongo.db.matches.find({}, MATCH_PROJECTION))
+        ids = {m[key] for m in matches for key in ("user1_id", "user2_id")}
+        users_by_id = {
+            u["_id"]: u for u in mongo.db.users.find({"_id": {"$in": list(ids)}}, PARTNER_PROJECTION)
+        }
+        stats = materialize_reveal_payloads(matches, users_by_id)
+        click.echo(f"Materialized {stats['reveal_payloads']} payloads "
+                   f"in {stats['reveal_payload_seconds']}s")
@@ -0,0 +1,218 @@
+"""Vectorized pair scoring: NumPy equivalent of calculate_pair_score."""
+
+import numpy as np
+
+from app.utils.hobbies import HobbyVocabulary
+from app.utils.zodiac_compat import SIGNS, _MATRIX
+
+# Index 12 is the "unknown sign" slot, which scores 50 against everything
+# (mirrors get_compatibility's default).
+_UNKNOWN_SIGN = len(SIGNS)
+_SIGN_INDEX = {sign: i for i, sign in enumerate(SIGNS)}
+_COMPAT = np.full((len(SIGNS) + 1, len(SIGNS) + 1), 50, dtype=np.int64)
+_COMPAT[:len(SIGNS), :len(SIGNS)] = np.array(_MATRIX, dtype=np.int64)
+
+
+def _sign_index(sign) -> int:
+    if not sign:
+        return _UNKNOWN_SIGN
+    return _SIGN_INDEX.get(sign.capitalize(), _UNKNOWN_SIGN)
+
+
+def encode_users(users: list) -> dict:
+    """
+    Encode user docs once into flat arrays for vectorized scoring.
+    Every field mirrors how calculate_pair_score / _gender_compatible read the doc.
+    """
+    n = len(users)
+    sun = np.empty(n, dtype=np.int64)
+    moon = np.empty(n, dtype=np.int64)
+    has_moon = np.zeros(n, dtype=bool)
+    intent = np.empty(n, dtype=np.int64)
+    intent_both = np.zeros(n, dtype=bool)
+    gender = np.full(n, -1, dtype=np.int64)
+
+    intent_codes = {}
+    gender_codes = {}
+    vocab = HobbyVocabulary()
+    hobby_masks = []
+    interest_rows = []
+
+    for i, user in enumerate(users):
+        zodiac = user.get("zodiac") or {}
+        sun[i] = _sign_index(zodiac.get("sun"))
+        moon_sign = zodiac.get("moon")
+        has_moon[i] = bool(moon_sign)
+        moon[i] = _sign_index(moon_sign)
+
+        lf = user.get("looking_for", "both")
+        intent[i] = intent_codes.setdefault(lf, len(intent_codes))
+        intent_both[i] = lf == "both"
+
+        g = user.get("gender")
+        if g:
+            gender[i] = gender_codes.setdefault(g, len(gender_codes))
+        interest_rows.append([
+            gender_codes.setdefault(x, len(gender_codes))
+            for x in (user.get("interested_in") or [])
+        ])
+
+        hobby_masks.append(vocab.mask(user.get("hobbies")))
+
+    interest = np.zeros((n, max(len(gender_codes), 1)), dtype=bool)
+    for i in range(n):
+        interest[i, interest_rows[i]] = True
+    hobbies = pack_masks(hobby_masks, vocab.words)
+
+    return {
+        "n": n,
+        "sun": sun,
+        "moon": moon,
+        "has_moon": has_moon,
+        "intent": intent,
+        "intent_both": intent_both,
+        "gender": gender,
+        "interest": interest,
+        "has_interest": interest.any(axis=1),
+        "hobbies": hobbies,
+        "has_hobbies": hobbies.any(axis=1),
+    }
+
+
+def pack_masks(masks: list, words: int) -> np.ndarray:
+    """Pack Python int bitmasks into an (n, words) uint64 array, low word first."""
+    packed = np.zeros((len(masks), words), dtype=np.uint64)
+    for w in range(words):
+        shift = 64 * w
+        packed[:, w] = [(m >> shift) & 0xFFFFFFFFFFFFFFFF for m in masks]
+    return packed
+
+
+def _hobby_overlap(hobbies: np.ndarray, rows, cols) -> np.ndarray:
+    """Popcount of AND-ed hobby bitsets, one uint64 word at a time."""
+    row_bits = hobbies[rows]
+    col_bits = hobbies[cols]
+    overlap = np.zeros((row_bits.shape[0], col_bits.shape[0]), dtype=np.int64)
+    for w in range(hobbies.shape[1]):
+        overlap += np.bitwise_count(row_bits[:, w][:, None] & col_bits[:, w][None, :])
+    return overlap
+
+
+def _gender_mask(enc: dict, rows, cols) -> np.ndarray:
+    """Vectorized _gender_compatible for every (row, col) user pair."""
+    gender = enc["gender"]
+    no_gender = gender < 0
+    safe_gender = np.where(no_gender, 0, gender)
+    interest = enc["interest"]
+    has_interest = enc["has_interest"]
+
+    # Row user's interested_in allows the column user's gender...
+    row_accepts = (
+        ~has_interest[rows][:, None]
+        | no_gender[cols][None, :]
+        | interest[rows][:, safe_gender[cols]]
+    )
+    # ...and the column user's interested_in allows the row user's gender
+    col_accepts = (
+        ~has_interest[cols][None, :]
+        | no_gender[rows][:, None]
+        | interest[cols][:, safe_gender[rows]].T
+    )
+    return row_accepts & col_accepts
+
+
+def score_block(enc: dict, rows, cols=slice(None)) -> dict:
+    """
+    Score a block of users against another (slices or index arrays).
+    Returns component matrices, the weighted total and the gender mask.
+    """
+    def outer(key):
+        return enc[key][rows][:, None], enc[key][cols][None, :]
+
+    sun1, sun2 = outer("sun")
+    sun_score = _COMPAT[sun1, sun2]
+
+    moon1, moon2 = outer("moon")
+    has_moon1, has_moon2 = outer("has_moon")
+    moon_score = np.where(has_moon1 & has_moon2, _COMPAT[moon1, moon2], sun_score)
+
+    hobby_overlap = _hobby_overlap(enc["hobbies"], rows, cols)
+    has_hobbies1, has_hobbies2 = outer("has_hobbies")
+    hobby_score = np.where(
+        has_hobbies1 | has_hobbies2, np.minimum(hobby_overlap / 3 * 100, 100), 50.0
+    )
+
+    intent1, intent2 = outer("intent")
+    both1, both2 = outer("intent_both")
+    intent_score = np.where(intent1 == intent2, 100, np.where(both1 | both2, 80, 40))
+
+    # Same operation order as calculate_pair_score so rounding is identical
+    total = np.rint(
+        sun_score * 0.40 + moon_score * 0.25 + hobby_score * 0.20 + intent_score * 0.15
+    ).astype(np.int64)
+
+    return {
+        "total": total,
+        "sun": sun_score,
+        "moon": moon_score,
+        "hobby_overlap": hobby_overlap,
+        "hobby_score": np.rint(hobby_score).astype(np.int64),
+        "intent": intent_score,
+        "compatible": _gender_mask(enc, rows, cols),
+    }
+
+
+def shard_edges(enc: dict, rows: np.ndarray, cols: np.ndarray, k: int = None,
+                same_bucket: np.ndarray = None) -> tuple:
+    """
+    Score one shard (row users against candidate column users).
+    With k, keep each row's k best compatible partners (directed edges).
+    Without k, keep every compatible pair once: columns flagged same_bucket
+    (the row's own bucket) only pair with higher indices.
+    Returns (rows, cols, scores) arrays.
+    """
+    block = score_block(enc, rows, cols)
+    not_self = rows[:, None] != cols[None, :]
+
+    if k is None:
+        keep = block["compatible"] & not_self
+        if same_bucket is not None:
+            keep &= ~same_bucket[None, :] | (rows[:, None] < cols[None, :])
+        r, c = np.nonzero(keep)
+        return rows[r], cols[c], block["total"][r, c]
+
+    kk = min(k, len(cols))
+    masked = np.where(block["compatible"] & not_self, block["total"], -1)
+    # Rank by score, ties by partner index: the same order as the best-first
+    # (score, lo, hi) list, so a row's top-K is an exact prefix of it
+    keys = (100 - masked) * enc["n"] + cols[None, :]
+    top = np.argpartition(keys, kk - 1, axis=1)[:, :kk]
+    top_scores = np.take_along_axis(masked, top, axis=1)
+    keep = top_scores >= 0
+    return (
+        np.broadcast_to(rows[:, None], top.shape)[keep],
+        cols[top][keep],
+        top_scores[keep],
+    )
+
+
+def merge_edges(parts: list, n: int) -> tuple:
+    """
+    Merge shard edges into undirected (lo, hi, scores), lo < hi, with
+    duplicates removed, ordered best first then by (lo, hi).
+    """
+    if not parts:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+
+    rows = np.concatenate([p[0] for p in parts])
+    cols = np.concatenate([p[1] for p in parts])
+    scores = np.concatenate([p[2] for p in parts])
+
+    # Undirected: (i, j) and (j, i) are the same edge
+    lo, hi = np.minimum(rows, cols), np.maximum(rows, cols)
+    _, first = np.unique(lo * n + hi, return_index=True)
+    lo, hi, scores = lo[first], hi[first], scores[first]
+
+    order = np.lexsort((hi, lo, -scores))
+    return lo[order], hi[order], scores[order]
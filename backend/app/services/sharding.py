@@ -0,0 +1,93 @@
+"""Multi-process pair scoring: row-block shards scored in a process pool."""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.services.scoring import merge_edges, shard_edges
+
+# Set once per worker process by the pool initializer
+_WORKER_ENC = None
+
+
+def _init_worker(enc: dict):
+    global _WORKER_ENC
+    _WORKER_ENC = enc
+
+
+def _score_shard(task: tuple) -> tuple:
+    rows, cols, same_bucket, k = task
+    return shard_edges(_WORKER_ENC, rows, cols, k, same_bucket)
+
+
+def build_shards(blocks: dict, shard_rows: int = 512, top_k: bool = False) -> list:
+    """
+    Split scoring into (rows, cols, same_bucket) shards of at most shard_rows
+    rows. For top-K each row sees every compatible bucket; otherwise only
+    buckets at or after its own, so each pair is scored once.
+    """
+    members = [np.array(m, dtype=np.int64) for m in blocks["members"]]
+    shards = []
+    for a, neighbors in enumerate(blocks["neighbors"]):
+        targets = neighbors if top_k else [b for b in neighbors if b >= a]
+        if not targets:
+            continue
+        cols = np.concatenate([members[b] for b in targets])
+        same_bucket = np.concatenate([np.full(len(members[b]), b == a) for b in targets])
+        for start in range(0, len(members[a]), shard_rows):
+            shards.append((members[a][start:start + shard_rows], cols, same_bucket))
+    return shards
+
+
+def score_shards(enc: dict, shards: list, k: int = None, workers: int = 1,
+                 merge: bool = True) -> tuple:
+    """
+    Score every shard and merge the per-shard edges into undirected
+    (lo, hi, scores), best first; merge=False returns the raw directed
+    (rows, cols, scores). Workers get the compact user encoding once at
+    startup and only index arrays per task.
+    """
+    tasks = [(rows, cols, same, k) for rows, cols, same in shards]
+
+    if workers <= 1 or len(tasks) <= 1:
+        parts = [shard_edges(enc, rows, cols, k, same) for rows, cols, same, k in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(enc,),
+        ) as pool:
+            parts = list(pool.map(_score_shard, tasks))
+
+    if not merge:
+        if not parts:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty
+        return tuple(np.concatenate([p[i] for p in parts]) for i in range(3))
+    return merge_edges(parts, enc["n"])
+
+
+def measure_scaling(enc: dict, shards: list, k: int = None, worker_counts: list = None) -> list:
+    """
+    Time score_shards at several worker counts. Efficiency is
+    t(1) / (workers * t(workers)); 1.0 is perfect linear scaling.
+    """
+    worker_counts = worker_counts or [1, 2, 4, 8, 16]
+    results = []
+    baseline = None
+    for workers in worker_counts:
+        started = time.perf_counter()
+        score_shards(enc, shards, k, workers)
+        seconds = time.perf_counter() - started
+        if baseline is None:
+            baseline = seconds * workers
+        results.append({
+            "workers": workers,
+            "seconds": round(seconds, 3),
+            "speedup": round(baseline / seconds, 2),
+            "efficiency": round(baseline / (seconds * workers), 2),
+        })
+    return results
@@ -0,0 +1,56 @@
+"""Short-TTL cache of serialized per-user responses, served with ETags."""
+
+import hashlib
+
+from flask import current_app, request
+
+from app.services import user_loader
+from app.utils.cache import TTLCache
+from app.utils.json_provider import dumps_bytes
+
+_cache = None
+
+
+def _get_cache() -> TTLCache:
+    global _cache
+    if _cache is None:
+        _cache = TTLCache(
+            maxsize=current_app.config.get("USER_CACHE_SIZE", 10000),
+            ttl=current_app.config.get("USER_CACHE_TTL_SECONDS", 30),
+        )
+    return _cache
+
+
+def cached_user_response(user_id: str, view: str, build, cacheable=None):
+    """
+    Serve `view` for a user from cache, or call build() -> (body, status) on a
+    miss. 200 bodies are cached with an ETag (unless cacheable(body) says
+    otherwise); a matching If-None-Match gets a 304 without touching the
+    database when the entry is cached.
+    """
+    cache = _get_cache()
+    key = (user_id, view)
+    entry = cache.get(key)
+
+    if entry is None:
+        body, status = build()
+        if status != 200:
+            return current_app.json.response(body), status
+        data = dumps_bytes(current_app.json, body)
+        entry = (data, hashlib.sha1(data).hexdigest())
+        if cacheable is None or cacheable(body):
+            cache.set(key, entry)
+
+    data, etag = entry
+    response = current_app.response_class(data, status=200, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(request)
+
+
+def invalidate_user(user_id: str):
+    """Drop every cached view (and the loaded doc) for a user after their document changes."""
+    user_loader.invalidate(user_id)
+    cache = _get_cache()
+    for view in ("me", "cosmic"):
+        cache.delete((user_id, view))
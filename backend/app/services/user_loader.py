@@ -0,0 +1,62 @@
+"""JWT identity -> user doc, memoized per request and in a short-TTL LRU."""
+
+from bson.objectid import ObjectId
+from flask import current_app, g, has_request_context, request
+
+from app import mongo
+from app.metrics import USER_LOADS
+from app.models.user import USER_PROJECTION
+from app.utils.cache import TTLCache
+
+_cache = None
+
+
+def _get_cache() -> TTLCache:
+    global _cache
+    if _cache is None:
+        _cache = TTLCache(
+            maxsize=current_app.config.get("USER_LOADER_SIZE", 10000),
+            ttl=current_app.config.get("USER_LOADER_TTL_SECONDS", 10),
+        )
+    return _cache
+
+
+def _count(outcome: str):
+    endpoint = request.endpoint if has_request_context() else None
+    USER_LOADS.labels(endpoint or "-", outcome).inc()
+
+
+def load_user(user_id) -> dict:
+    """
+    User doc (USER_PROJECTION fields) or None. Repeat loads within a request
+    are free and other requests hit the LRU for USER_LOADER_TTL_SECONDS.
+    Returned docs are shared: treat them as read-only.
+    """
+    key = str(user_id)
+    memo = g.setdefault("loaded_users", {}) if has_request_context() else {}
+    if key in memo:
+        _count("request")
+        return memo[key]
+
+    cache = _get_cache()
+    user = cache.get(key)
+    if user is not None:
+        _count("lru")
+    else:
+        _count("miss")
+        user = mongo.db.users.find_one({"_id": ObjectId(key)}, USER_PROJECTION)
+        # Pending charts are filled in by the worker, which can't invalidate us
+        if user is not None and user.get("chart_status") != "pending":
+            cache.set(key, user)
+
+    memo[key] = user
+    return user
+
+
+def invalidate(user_id):
+    """Forget a user after writing to their doc (this request and the LRU)."""
+    key = str(user_id)
+    _get_cache().delete(key)
+    if has_request_context():
+        g.get("loaded_users", {}).pop(key, None)
+
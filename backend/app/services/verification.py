@@ -0,0 +1,55 @@
+"""Email verification codes, kept off the user doc in their own TTL collection."""
+
+import hmac
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ReturnDocument
+
+from app import mongo
+from app.utils.email import generate_verification_code
+
+CODES = "verification_codes"
+
+# check_code results
+CODE_OK = "ok"
+CODE_INVALID = "invalid"
+CODE_MISSING = "missing"    # never issued, used or expired
+CODE_LOCKED = "locked"      # too many wrong guesses; a new code is needed
+
+
+def issue_code(email: str, ttl_seconds: int = 600) -> str:
+    """Create (or replace) the pending code for an email; resets attempts."""
+    code = generate_verification_code()
+    now = datetime.now(timezone.utc)
+    mongo.db[CODES].replace_one(
+        {"_id": email},
+        {
+            "code": code,
+            "attempts": 0,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=ttl_seconds),
+        },
+        upsert=True,
+    )
+    return code
+
+
+def check_code(email: str, code: str, max_attempts: int = 5) -> str:
+    """
+    Count an attempt against the email's code and compare. A correct code is
+    consumed; after max_attempts wrong guesses the code stops working.
+    """
+    doc = mongo.db[CODES].find_one_and_update(
+        {"_id": email, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+        {"$inc": {"attempts": 1}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if doc is None:
+        return CODE_MISSING
+    if doc["attempts"] > max_attempts:
+        return CODE_LOCKED
+    if not hmac.compare_digest(doc["code"], code):
+        return CODE_INVALID
+
+    mongo.db[CODES].delete_one({"_id": email, "code": doc["code"]})
+    return CODE_OK
@@ -0,0 +1,97 @@
+"""Offline gazetteer: resolve free-text birth locations to coordinates and timezone."""
+
+import csv
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^a-z0-9]+", " ", text.lower())
+    # "Saint Petersburg" and "St. Petersburg" are the same place
+    text = re.sub(r"\bsaint\b", "st", text)
+    return text.strip()
+
+
+@lru_cache(maxsize=1)
+def _load() -> tuple:
+    """Build (cities by name, regions by name) from the bundled CSVs, once."""
+    cities = {}
+    with open(os.path.join(DATA_DIR, "cities.csv"), encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            place = {
+                "name": row["name"],
+                "country": row["country"],
+                "region": row["region"] or None,
+                "lat": float(row["lat"]),
+                "lng": float(row["lng"]),
+                "tz": row["tz"],
+                "population": int(row["population"]),
+            }
+            key = normalize(row["name"])
+            cities.setdefault(key, []).append(place)
+            # "New York City" is usually written "New York"
+            if key.endswith(" city"):
+                cities.setdefault(key[:-len(" city")], []).append(place)
+
+    for places in cities.values():
+        places.sort(key=lambda p: -p["population"])
+
+    regions = {}
+    with open(os.path.join(DATA_DIR, "regions.csv"), encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            regions.setdefault(normalize(row["name"]), (row["country"], row["region"] or None))
+
+    return cities, regions
+
+
+def _qualifier(text: str, regions: dict):
+    """
+    Match a whole qualifier ("FL", "Florida 32789", "USA") to (country, region).
+    Never word by word: codes like DE, IN, OR and ME are ordinary words in
+    names such as "Ile-de-France". Zip codes are dropped first.
+    """
+    key = " ".join(word for word in normalize(text).split() if not word.isdigit())
+    return regions.get(key)
+
+
+@lru_cache(maxsize=4096)
+def resolve_location(text: str):
+    """
+    Resolve "City", "City, ST" or "City, Country" to a place dict with
+    lat/lng/tz, preferring the most populous match. Returns None if the
+    city isn't in the gazetteer or contradicts its qualifiers.
+    """
+    cities, regions = _load()
+    parts = [p for p in (text or "").split(",") if p.strip()]
+    if not parts:
+        return None
+
+    name = normalize(parts[0])
+    if name not in cities and len(parts) == 1:
+        # No comma ("Orlando Florida"): split off trailing words as the qualifier
+        words = name.split()
+        for cut in range(len(words) - 1, 0, -1):
+            head = " ".join(words[:cut])
+            if head in cities:
+                name, parts = head, [head, " ".join(words[cut:])]
+                break
+
+    candidates = cities.get(name, [])
+    for part in parts[1:]:
+        qualifier = _qualifier(part, regions)
+        if qualifier is None:
+            continue  # zip codes, neighbourhoods, typos: don't let them veto
+        country, region = qualifier
+        candidates = [
+            p for p in candidates
+            if p["country"] == country and (region is None or p["region"] == region)
+        ]
+
+    return candidates[0] if candidates else None
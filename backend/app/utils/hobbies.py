@@ -0,0 +1,35 @@
+"""Hobby vocabulary interning: hobby lists as integer bitmasks."""
+
+
+class HobbyVocabulary:
+    """
+    Maps each hobby string to a bit position so a user's hobbies become one int.
+    Python ints are unbounded, so vocabularies past 64 entries just use more bits.
+    """
+
+    def __init__(self):
+        self._bits = {}
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+    def bit(self, hobby: str) -> int:
+        """Bit position for a hobby, assigning the next free one if unseen."""
+        return self._bits.setdefault(hobby, len(self._bits))
+
+    def mask(self, hobbies: list) -> int:
+        """Bitmask for a user's `hobbies` list (duplicates collapse like a set)."""
+        m = 0
+        for hobby in hobbies or []:
+            m |= 1 << self.bit(hobby)
+        return m
+
+    @property
+    def words(self) -> int:
+        """Number of uint64 words needed to hold a mask from this vocabulary."""
+        return max((len(self._bits) + 63) // 64, 1)
+
+
+def hobby_overlap(mask1: int, mask2: int) -> int:
+    """Count hobbies two users share (popcount of the AND)."""
+    return (mask1 & mask2).bit_count()
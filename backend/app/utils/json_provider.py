@@ -0,0 +1,59 @@
+"""Pluggable JSON provider: orjson for responses when it's installed."""
+
+from flask.json.provider import DefaultJSONProvider, _default
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson. Output matches the default provider
+    (sorted keys, Flask's handling of datetimes, decimals and the like) except
+    that non-ASCII text is written as UTF-8 rather than \\u escapes.
+    Calls with json.dumps keyword arguments fall back to the stdlib.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        import orjson
+
+        self._orjson = orjson
+        self._options = (
+            orjson.OPT_SORT_KEYS
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME  # Flask renders these as HTTP dates
+        )
+
+    def dumps_bytes(self, obj) -> bytes:
+        return self._orjson.dumps(obj, default=_default, option=self._options)
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return self._orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)  # pretty-printed
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
+
+
+def dumps_bytes(provider, obj) -> bytes:
+    """Encode with the app's JSON provider, skipping the str round trip when it can."""
+    if isinstance(provider, OrjsonProvider):
+        return provider.dumps_bytes(obj)
+    return provider.dumps(obj).encode("utf-8")
+
+
+def configure_json(app):
+    """Install the provider named by JSON_PROVIDER ("orjson" or "default")."""
+    if app.config.get("JSON_PROVIDER", "orjson") != "orjson":
+        return
+    try:
+        app.json = OrjsonProvider(app)
+    except ImportError:
+        print("orjson not installed, using the default JSON provider")
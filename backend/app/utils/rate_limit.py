@@ -0,0 +1,92 @@
+"""Token-bucket rate limiters: per-process (memory) or shared across workers (MongoDB)."""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ReturnDocument
+
+
+class MemoryRateLimiter:
+    """
+    Token buckets in a bounded LRU dict. Limits apply per process, so with N
+    gunicorn workers a client can get up to N times the rate.
+    """
+
+    def __init__(self, per_minute: float, burst: int, max_keys: int = 100000):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, cost: float = 1) -> tuple:
+        """Take `cost` tokens. Returns (allowed, retry_after_seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0 if allowed else (cost - tokens) / self.rate
+
+
+class MongoRateLimiter:
+    """
+    Token buckets shared by every worker, one doc per key. Refill and take
+    happen in a single atomic pipeline update; idle buckets expire via a TTL
+    index on expires_at.
+    """
+
+    def __init__(self, collection, per_minute: float, burst: int):
+        self.collection = collection
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        # A bucket left alone this long is full again, so it can be dropped
+        self.idle = timedelta(seconds=burst / self.rate if self.rate else 3600)
+
+    def allow(self, key: str, cost: float = 1) -> tuple:
+        """Take `cost` tokens. Returns (allowed, retry_after_seconds)."""
+        now = datetime.now(timezone.utc)
+        doc = self.collection.find_one_and_update(
+            {"_id": key},
+            self.pipeline(now, cost),
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc["allowed"]:
+            return True, 0
+        return False, (cost - doc["tokens"]) / self.rate
+
+    def pipeline(self, now: datetime, cost: float) -> list:
+        # Refill clock kept as epoch ms so the arithmetic is plain numbers
+        now_ms = int(now.timestamp() * 1000)
+        elapsed_ms = {"$subtract": [now_ms, {"$ifNull": ["$updated_ms", now_ms]}]}
+        refilled = {"$min": [
+            self.burst,
+            {"$add": [
+                {"$ifNull": ["$tokens", self.burst]},
+                {"$multiply": [elapsed_ms, self.rate / 1000.0]},
+            ]},
+        ]}
+        return [
+            {"$set": {"tokens": refilled}},
+            {"$set": {"allowed": {"$gte": ["$tokens", cost]}}},
+            {"$set": {
+                "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]},
+                "updated_ms": now_ms,
+                "expires_at": now + self.idle,
+            }},
+        ]
+
+
+def build_limiter(backend: str, collection, per_minute: float, burst: int):
+    """"memory" or "mongo" limiter; collection is only used by the latter."""
+    if backend == "mongo":
+        return MongoRateLimiter(collection, per_minute, burst)
+    return MemoryRateLimiter(per_minute, burst)
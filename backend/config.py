@@ -10,5 +10,53 @@ class Config:
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "orbit-jwt-secret-change-me")
     JWT_ACCESS_TOKEN_EXPIRES = 60 * 60 * 24 * 30  # 30 days
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "")  # point at any OpenAI-compatible server
     ALLOWED_EMAIL_DOMAINS = ["rollins.edu"]
     MATCH_REVEAL_DATE = os.getenv("MATCH_REVEAL_DATE", "2026-02-13T20:00:00")
+    MATCHING_ENGINE = os.getenv("MATCHING_ENGINE", "numpy")  # "numpy" | "python" (reference)
+    MATCHING_MODE = os.getenv("MATCHING_MODE", "greedy")  # "greedy" | "optimal"
+    MATCHING_TOP_K = int(os.getenv("MATCHING_TOP_K", "20"))
+    MATCHING_OPTIMAL_MAX_USERS = int(os.getenv("MATCHING_OPTIMAL_MAX_USERS", "2000"))  # blossom cap
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+    LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+    DESCRIPTION_CACHE_ENABLED = os.getenv("DESCRIPTION_CACHE_ENABLED", "true").lower() == "true"
+    DESCRIPTION_CACHE_LRU_SIZE = int(os.getenv("DESCRIPTION_CACHE_LRU_SIZE", "2048"))
+    DESCRIPTION_CACHE_TTL_DAYS = int(os.getenv("DESCRIPTION_CACHE_TTL_DAYS", "30"))
+    DESCRIPTION_CACHE_MAX_DOCS = int(os.getenv("DESCRIPTION_CACHE_MAX_DOCS", "50000"))
+    DESCRIPTION_CACHE_SCORE_BUCKET = int(os.getenv("DESCRIPTION_CACHE_SCORE_BUCKET", "5"))
+    MATCH_WRITE_BATCH_SIZE = int(os.getenv("MATCH_WRITE_BATCH_SIZE", "1000"))
+    MATCHING_INCREMENTAL = os.getenv("MATCHING_INCREMENTAL", "false").lower() == "true"
+    JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+    JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "600"))  # no heartbeat -> failed
+    MATCHING_WORKERS = int(os.getenv("MATCHING_WORKERS", "1"))  # processes for NumPy pair scoring
+    MATCHING_SHARD_ROWS = int(os.getenv("MATCHING_SHARD_ROWS", "512"))
+    ENSURE_INDEXES_ON_STARTUP = os.getenv("ENSURE_INDEXES_ON_STARTUP", "true").lower() == "true"
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+    NATAL_CHART_ASYNC = os.getenv("NATAL_CHART_ASYNC", "true").lower() == "true"
+    CHART_STALE_SECONDS = int(os.getenv("CHART_STALE_SECONDS", "120"))
+    STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "1000"))
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson")
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", "2"))
+    # Workers + queue depth must stay below gunicorn's --threads (8, see Procfile)
+    # so a sign-up burst gets fast 503s instead of taking every request thread
+    BCRYPT_QUEUE_DEPTH = int(os.getenv("BCRYPT_QUEUE_DEPTH", "2"))
+    BCRYPT_TIMEOUT_SECONDS = float(os.getenv("BCRYPT_TIMEOUT_SECONDS", "5"))
+    VERIFICATION_CODE_TTL_SECONDS = int(os.getenv("VERIFICATION_CODE_TTL_SECONDS", "600"))
+    VERIFICATION_MAX_ATTEMPTS = int(os.getenv("VERIFICATION_MAX_ATTEMPTS", "5"))
+    AUTH_RATE_LIMIT_ENABLED = os.getenv("AUTH_RATE_LIMIT_ENABLED", "true").lower() == "true"
+    AUTH_RATE_LIMIT_BACKEND = os.getenv("AUTH_RATE_LIMIT_BACKEND", "memory")  # "memory" | "mongo"
+    AUTH_RATE_PER_MINUTE_IP = float(os.getenv("AUTH_RATE_PER_MINUTE_IP", "120"))
+    AUTH_RATE_BURST_IP = int(os.getenv("AUTH_RATE_BURST_IP", "60"))
+    AUTH_RATE_PER_MINUTE_EMAIL = float(os.getenv("AUTH_RATE_PER_MINUTE_EMAIL", "5"))
+    AUTH_RATE_BURST_EMAIL = int(os.getenv("AUTH_RATE_BURST_EMAIL", "10"))
+    TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "1"))  # Railway's edge proxy; 0 if exposed directly
+    GUEST_TTL_DAYS = int(os.getenv("GUEST_TTL_DAYS", "7"))
+    USER_LOADER_SIZE = int(os.getenv("USER_LOADER_SIZE", "10000"))
+    USER_LOADER_TTL_SECONDS = int(os.getenv("USER_LOADER_TTL_SECONDS", "10"))
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")  # Bearer token for /metrics; open if empty
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # worker.py metrics server; 0 = off
@@ -0,0 +1,287 @@
+"""
+Matching benchmark on a seeded synthetic population. For each size it runs
+in a fresh process (so peak RSS is per size) and records:
+
+  - calculate_pair_score / _gender_compatible throughput on sampled pairs
+  - run_matching wall time per phase (loading, scoring, assigning, ...)
+  - peak RSS, and with --trace-memory the tracemalloc peak per phase
+  - with --workers 1,2,4, pair-scoring speedup per worker count
+
+Runs against mongomock by default (pip install mongomock), or a local mongod with --mongo-uri
+(the database name must contain "bench"; it is dropped before each size).
+Results are written as JSON; --baseline compares against an earlier file.
+
+    python scripts/bench_matching.py --sizes 1000 5000 20000 50000
+    python scripts/bench_matching.py --sizes 5000 --baseline bench/last.json
+    python scripts/bench_matching.py --sizes 20000 --workers 1,2,4
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR, os.path.dirname(os.path.abspath(__file__))]
+
+DEFAULT_SIZES = [1000, 5000, 20000, 50000]
+
+
+class PhaseRecorder:
+    """on_progress callback that times each run_matching phase (and its memory peak)."""
+
+    def __init__(self, trace_memory: bool):
+        self.trace_memory = trace_memory
+        self.phase = None
+        self.started = None
+        self.phases = {}
+        self.counts = {}
+
+    def __call__(self, phase: str, **counts):
+        self.counts.update(counts)
+        if phase != self.phase:
+            self._close()
+            self.phase = phase
+            self.started = time.perf_counter()
+            if self.trace_memory:
+                import tracemalloc
+                tracemalloc.reset_peak()
+
+    def _close(self):
+        if self.phase is None:
+            return
+        entry = {"seconds": round(time.perf_counter() - self.started, 4)}
+        if self.trace_memory:
+            import tracemalloc
+            entry["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+        self.phases[self.phase] = entry
+
+    def finish(self):
+        self._close()
+        self.phase = None
+
+
+def _throughput(fn, pairs: list) -> dict:
+    started = time.perf_counter()
+    for u1, u2 in pairs:
+        fn(u1, u2)
+    seconds = time.perf_counter() - started
+    return {
+        "calls": len(pairs),
+        "seconds": round(seconds, 4),
+        "calls_per_second": round(len(pairs) / seconds),
+    }
+
+
+def run_size(size: int, args) -> dict:
+    """Benchmark one population size in this process."""
+    os.environ["OPENAI_API_KEY"] = ""  # descriptions come from the template
+    os.environ["ENSURE_INDEXES_ON_STARTUP"] = "false"
+    if args.mongo_uri:
+        os.environ["MONGO_URI"] = args.mongo_uri
+
+    from app import create_app, mongo
+    from app.services.matching import _gender_compatible, calculate_pair_score, run_matching
+    from synthetic_users import generate_users
+
+    app = create_app()
+    app.config["DESCRIPTION_CACHE_ENABLED"] = False
+    if not args.mongo_uri:
+        import mongomock
+        import mongomock.gridfs
+
+        mongomock.gridfs.enable_gridfs_integration()
+        mongo.cx = mongomock.MongoClient()
+        mongo.db = mongo.cx.orbit_bench
+
+    result = {
+        "size": size,
+        "engine": args.engine or app.config["MATCHING_ENGINE"],
+        "mode": args.mode or app.config["MATCHING_MODE"],
+        "workers": app.config.get("MATCHING_WORKERS", 1),
+    }
+    started = time.perf_counter()
+    users = generate_users(size, seed=args.seed)
+    result["generate_seconds"] = round(time.perf_counter() - started, 4)
+
+    rng = random.Random(args.seed)
+    pairs = [(rng.choice(users), rng.choice(users)) for _ in range(args.pairs)]
+    result["calculate_pair_score"] = _throughput(calculate_pair_score, pairs)
+    result["gender_compatible"] = _throughput(_gender_compatible, pairs)
+    if args.workers:
+        result["scaling"] = _scaling(app, users, args.workers)
+
+    with app.app_context():
+        mongo.db.users.drop()
+        mongo.db.matches.drop()
+        for start in range(0, size, 5000):
+            mongo.db.users.insert_many(users[start:start + 5000], ordered=False)
+        mongo.db.users.create_index("onboarding_complete")
+        del users, pairs
+
+        if args.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+
+        recorder = PhaseRecorder(args.trace_memory)
+        started = time.perf_counter()
+        summary = run_matching(engine=args.engine, mode=args.mode, on_progress=recorder)
+        recorder.finish()
+
+    result["run_matching"] = {
+        "seconds": round(time.perf_counter() - started, 4),
+        "phases": recorder.phases,
+        "counts": recorder.counts,
+        "matches_created": summary.get("matches_created"),
+        "users_matched": summary.get("users_matched"),
+    }
+    # ru_maxrss is KiB on Linux
+    result["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+    if args.mongo_uri:
+        mongo.cx.drop_database(mongo.db.name)
+    return result
+
+
+def _scaling(app, users: list, worker_counts: list) -> list:
+    """sharding.measure_scaling over the same shards run_matching scores."""
+    from app.services.matching import _block_users
+    from app.services.scoring import encode_users
+    from app.services.sharding import build_shards, measure_scaling
+
+    shards = build_shards(_block_users(users), app.config["MATCHING_SHARD_ROWS"], top_k=True)
+    return measure_scaling(encode_users(users), shards, app.config["MATCHING_TOP_K"], worker_counts)
+
+
+def _environment(args) -> dict:
+    import numpy
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "backend": "mongod" if args.mongo_uri else "mongomock",
+        "seed": args.seed,
+        "trace_memory": args.trace_memory,
+    }
+
+
+def compare(results: list, baseline: dict, max_ratio: float) -> list:
+    """Phase timings that got slower than max_ratio x the baseline's."""
+    previous = {r["size"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        old = previous.get(r["size"])
+        if not old:
+            continue
+        timings = {name: p["seconds"] for name, p in r["run_matching"]["phases"].items()}
+        timings["total"] = r["run_matching"]["seconds"]
+        old_timings = {name: p["seconds"] for name, p in old["run_matching"]["phases"].items()}
+        old_timings["total"] = old["run_matching"]["seconds"]
+        for name, seconds in timings.items():
+            before = old_timings.get(name)
+            if before and before >= 0.05 and seconds / before > max_ratio:
+                regressions.append(
+                    f"{r['size']} users, {name}: {before:.2f}s -> {seconds:.2f}s "
+                    f"({seconds / before:.2f}x)"
+                )
+    return regressions
+
+
+def _print_result(r: dict):
+    phases = ", ".join(f"{name} {p['seconds']:.2f}s" for name, p in r["run_matching"]["phases"].items())
+    print(f"{r['size']:>6} users: run_matching {r['run_matching']['seconds']:.2f}s ({phases}); "
+          f"peak RSS {r['peak_rss_mb']:.0f}MB; "
+          f"pair_score {r['calculate_pair_score']['calls_per_second']:,}/s, "
+          f"gender {r['gender_compatible']['calls_per_second']:,}/s")
+    for s in r.get("scaling", []):
+        print(f"        {s['workers']:>2} workers: scoring {s['seconds']:.2f}s, "
+              f"speedup {s['speedup']:.2f}x, efficiency {s['efficiency']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark matching on synthetic users.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--pairs", type=int, default=100000,
+                        help="Sampled pairs for the pair-score microbenchmarks")
+    parser.add_argument("--engine", default=None, help="numpy | python (default: config)")
+    parser.add_argument("--mode", default=None, help="greedy | optimal (default: config)")
+    parser.add_argument("--mongo-uri", default=None,
+                        help="Local mongod, e.g. mongodb://localhost:27017/orbit_bench")
+    parser.add_argument("--workers", type=lambda v: [int(x) for x in v.split(",")], default=None,
+                        help="Worker counts for the scoring scaling run, e.g. 1,2,4")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="tracemalloc peak per phase (slows the run down)")
+    parser.add_argument("--output", default=None, help="JSON results path")
+    parser.add_argument("--baseline", default=None, help="Earlier results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=1.25,
+                        help="Fail if a phase is this many times slower than the baseline")
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)  # child process
+    args = parser.parse_args()
+
+    if args.mongo_uri and "bench" not in args.mongo_uri.rsplit("/", 1)[-1]:
+        parser.error("--mongo-uri must name a database containing 'bench'; it gets dropped")
+
+    if args.size is not None:
+        print(json.dumps(run_size(args.size, args)))
+        return
+
+    passthrough = ["--seed", str(args.seed), "--pairs", str(args.pairs)]
+    for flag, value in (("--engine", args.engine), ("--mode", args.mode),
+                        ("--mongo-uri", args.mongo_uri)):
+        if value:
+            passthrough += [flag, value]
+    if args.workers:
+        passthrough += ["--workers", ",".join(map(str, args.workers))]
+    if args.trace_memory:
+        passthrough.append("--trace-memory")
+    results = []
+    for size in args.sizes:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--size", str(size)] + passthrough,
+            cwd=BACKEND_DIR, capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            sys.stderr.write(out.stderr)
+            sys.exit(f"Benchmark for {size} users failed")
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        _print_result(result)
+        results.append(result)
+
+    report = {"environment": _environment(args), "results": results}
+    output = args.output or os.path.join(
+        BACKEND_DIR, "bench", f"matching-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
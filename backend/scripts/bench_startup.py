@@ -0,0 +1,88 @@
+"""
+Startup benchmark: time `from app import create_app` and `create_app()` in
+fresh interpreters (what a cold container or a recycled gunicorn worker pays)
+and fail if the median goes over budget or a heavy dependency loads at boot.
+
+    python scripts/bench_startup.py [--runs 5] [--budget-ms N] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from config import Config  # noqa: E402
+
+# Only needed by the matching job, auth writes or chart workers; must be
+# imported on first use rather than when a web worker boots
+HEAVY_MODULES = ("openai", "kerykeion", "bcrypt", "numpy", "networkx")
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+create_app()
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "init_ms": (t2 - t1) * 1000,
+    "heavy": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def probe() -> dict:
+    env = dict(os.environ, ENSURE_INDEXES_ON_STARTUP="false")
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=Config.STARTUP_BUDGET_MS)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    runs = [probe() for _ in range(args.runs)]
+    import_ms = statistics.median(r["import_ms"] for r in runs)
+    init_ms = statistics.median(r["init_ms"] for r in runs)
+    total_ms = statistics.median(r["import_ms"] + r["init_ms"] for r in runs)
+    heavy = sorted({m for r in runs for m in r["heavy"]})
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"startup {total_ms:.0f}ms is over the {args.budget_ms:.0f}ms budget")
+    if heavy:
+        failures.append(f"heavy modules imported at startup: {', '.join(heavy)}")
+
+    result = {
+        "runs": args.runs,
+        "import_ms": round(import_ms, 1),
+        "init_ms": round(init_ms, 1),
+        "total_ms": round(total_ms, 1),
+        "budget_ms": args.budget_ms,
+        "heavy_modules": heavy,
+        "failures": failures,
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"create_app startup (median of {args.runs}): import {import_ms:.0f}ms "
+              f"+ init {init_ms:.0f}ms = {total_ms:.0f}ms (budget {args.budget_ms:.0f}ms)")
+        for failure in failures:
+            print(f"FAIL {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Rebuild the bundled gazetteer in app/data from GeoNames (CC BY 4.0) via the
+geonamescache package. Only needed when refreshing the data:
+
+    pip install geonamescache && python scripts/build_gazetteer.py
+"""
+
+import csv
+import os
+
+import geonamescache
+
+# Every US city GeoNames lists (population >= 15k); elsewhere only larger ones
+MIN_POPULATION_ABROAD = 100000
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "app", "data")
+
+# Common ways people write a country that GeoNames doesn't list by name
+COUNTRY_ALIASES = {
+    "US": ["USA", "US", "U.S.", "U.S.A.", "United States of America", "America"],
+    "GB": ["UK", "U.K.", "England", "Scotland", "Wales", "Great Britain", "Britain"],
+    "AE": ["UAE"],
+    "KR": ["Korea"],
+}
+
+
+def main():
+    gc = geonamescache.GeonamesCache()
+
+    cities = [
+        c for c in gc.get_cities().values()
+        if c["countrycode"] == "US" or c["population"] >= MIN_POPULATION_ABROAD
+    ]
+    cities.sort(key=lambda c: (c["countrycode"], c["name"], -c["population"]))
+
+    with open(os.path.join(DATA_DIR, "cities.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "country", "region", "lat", "lng", "tz", "population"])
+        for c in cities:
+            writer.writerow([
+                c["name"],
+                c["countrycode"],
+                c["admin1code"] if c["countrycode"] == "US" else "",
+                round(c["latitude"], 4),
+                round(c["longitude"], 4),
+                c["timezone"],
+                c["population"],
+            ])
+
+    with open(os.path.join(DATA_DIR, "regions.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "country", "region"])
+        for code, country in sorted(gc.get_countries().items()):
+            for name in [country["name"], country["iso3"]] + COUNTRY_ALIASES.get(code, []):
+                writer.writerow([name, code, ""])
+        for code, state in sorted(gc.get_us_states().items()):
+            writer.writerow([state["name"], "US", code])
+            writer.writerow([code, "US", code])
+
+    print(f"Wrote {len(cities)} cities to {os.path.normpath(DATA_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
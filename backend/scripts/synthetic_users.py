@@ -0,0 +1,85 @@
+"""
+Seeded synthetic user population for benchmarks: onboarded user docs shaped
+like the ones update_me writes, with campus-like distributions.
+"""
+
+import random
+from datetime import date, timedelta
+
+from bson.objectid import ObjectId
+
+from app.utils.zodiac_compat import SIGNS, get_sun_sign
+
+# Roughly Zipf-popular campus hobbies: a few everyone picks, a long tail
+HOBBIES = [
+    "music", "movies", "travel", "coffee", "gym", "hiking", "photography", "cooking",
+    "reading", "gaming", "dancing", "beach", "concerts", "art", "fashion", "yoga",
+    "running", "basketball", "soccer", "thrifting", "podcasts", "anime", "baking",
+    "tennis", "volleyball", "surfing", "painting", "writing", "theatre", "astrology",
+    "skateboarding", "chess", "poetry", "rowing", "volunteering", "kpop", "climbing",
+    "fishing", "golf", "journaling", "skincare", "tarot", "cycling", "swimming",
+    "singing", "guitar", "piano", "film photography", "board games", "sailing",
+]
+_HOBBY_WEIGHTS = [1 / (rank + 1) ** 0.8 for rank in range(len(HOBBIES))]
+
+# (gender, weight, [(interested_in, weight), ...])
+_GENDERS = [
+    ("woman", 0.54, [(["man"], 0.72), (["woman"], 0.08), (["man", "woman"], 0.14),
+                     (["man", "woman", "nonbinary"], 0.04), ([], 0.02)]),
+    ("man", 0.42, [(["woman"], 0.84), (["man"], 0.07), (["man", "woman"], 0.05),
+                   (["man", "woman", "nonbinary"], 0.02), ([], 0.02)]),
+    ("nonbinary", 0.03, [(["man", "woman", "nonbinary"], 0.6), (["woman"], 0.2), (["man"], 0.2)]),
+    (None, 0.01, [([], 1.0)]),
+]
+
+_LOOKING_FOR = [("date", 0.45), ("both", 0.35), ("friend", 0.2)]
+
+
+def _pick(rng: random.Random, options: list):
+    values, weights = zip(*options)
+    return rng.choices(values, weights)[0]
+
+
+def generate_users(n: int, seed: int = 0, moon_rate: float = 0.6) -> list:
+    """
+    n onboarded user docs. Birthdays are uniform over 2002-2007 (so sun signs
+    follow the calendar); moon_rate of users gave a birth time and place and
+    have moon/rising. Same seed, same population.
+    """
+    rng = random.Random(seed)
+    # Ids from their own stream, so they don't shift the profile draws
+    id_rng = random.Random(f"ids-{seed}")
+    first_day = date(2002, 1, 1)
+    span = (date(2007, 12, 31) - first_day).days
+
+    users = []
+    for i in range(n):
+        dob = first_day + timedelta(days=rng.randrange(span))
+        has_chart = rng.random() < moon_rate
+        gender, interests = _pick(rng, [((g, ints), w) for g, w, ints in _GENDERS])
+        hobbies = set()
+        for _ in range(rng.randint(2, 8)):
+            hobbies.add(rng.choices(HOBBIES, _HOBBY_WEIGHTS)[0])
+
+        users.append({
+            "_id": ObjectId(id_rng.randbytes(12)),
+            "email": f"bench{i}@rollins.edu",
+            "name": f"Bench User {i}",
+            "dob": dob.isoformat(),
+            "zodiac": {
+                "sun": get_sun_sign(dob.month, dob.day),
+                "moon": rng.choice(SIGNS) if has_chart else None,
+                "rising": rng.choice(SIGNS) if has_chart else None,
+            },
+            "chart_status": "complete" if has_chart else "sun_only",
+            "hobbies": sorted(hobbies),
+            "looking_for": _pick(rng, _LOOKING_FOR),
+            "gender": gender,
+            "interested_in": list(_pick(rng, interests)),
+            "instagram": f"@bench{i}",
+            "phone": None,
+            "is_guest": False,
+            "onboarding_complete": True,
+            "email_verified": True,
+        })
+    return users
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR, os.path.join(BACKEND_DIR, "scripts")]
+
+# Before config is imported: no OpenAI calls, no index bootstrap thread
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["ENSURE_INDEXES_ON_STARTUP"] = "false"
+
+
+@pytest.fixture
+def app():
+    """App on an in-memory mongomock database, inside an app context."""
+    mongomock = pytest.importorskip("mongomock")
+    import mongomock.gridfs
+
+    from app import create_app, mongo
+
+    mongomock.gridfs.enable_gridfs_integration()
+    app = create_app()
+    app.config.update(TESTING=True, DESCRIPTION_CACHE_ENABLED=False)
+    mongo.cx = mongomock.MongoClient()
+    mongo.db = mongo.cx.orbit_test
+    with app.app_context():
+        yield app
@@ -0,0 +1,12 @@
+from app.services.astrology import calculate_natal_chart
+from app.services.scoring import _UNKNOWN_SIGN, _sign_index
+from app.utils.zodiac_compat import SIGNS
+
+
+def test_computed_chart_uses_signs_scoring_recognises():
+    chart = calculate_natal_chart("Test", 2004, 5, 6, 10, 30, "Orlando, FL")
+
+    assert chart["sun"] == "Taurus"
+    for key in ("sun", "moon", "rising"):
+        assert chart[key] in SIGNS
+        assert _sign_index(chart[key]) != _UNKNOWN_SIGN
@@ -0,0 +1,100 @@
+import pytest
+
+from app.routes import auth
+
+
+@pytest.fixture
+def limited_app(app):
+    app.config.update(AUTH_RATE_LIMIT_ENABLED=True, AUTH_RATE_LIMIT_BACKEND="memory",
+                      AUTH_RATE_PER_MINUTE_IP=0.001, AUTH_RATE_BURST_IP=2)
+    auth._limiters.clear()
+    yield app
+    auth._limiters.clear()
+
+
+def _login(client, forwarded_for: str):
+    # Same proxy address for everyone, like Railway's edge
+    return client.post("/auth/login", json={}, headers={"X-Forwarded-For": forwarded_for},
+                       environ_base={"REMOTE_ADDR": "10.0.0.1"})
+
+
+def test_ip_limit_is_per_client_behind_proxy(limited_app):
+    client = limited_app.test_client()
+
+    assert [_login(client, "203.0.113.7").status_code for _ in range(3)] == [400, 400, 429]
+    # Another client behind the same proxy still has its own bucket
+    assert _login(client, "198.51.100.2").status_code == 400
+
+
+def test_spoofed_forwarded_for_is_skipped(limited_app):
+    client = limited_app.test_client()
+
+    # The proxy appends the real client; anything before it is client-supplied
+    statuses = [_login(client, f"1.2.3.{i}, 203.0.113.7").status_code for i in range(3)]
+    assert statuses == [400, 400, 429]
+
+
+def test_default_trusts_one_proxy(limited_app):
+    assert limited_app.config["TRUSTED_PROXY_COUNT"] == 1
+
+
+@pytest.fixture
+def signup(app):
+    app.config.update(AUTH_RATE_LIMIT_ENABLED=False, ALLOWED_EMAIL_DOMAINS=["school.edu"])
+    client = app.test_client()
+
+    def register(ttl_seconds: int = 600) -> str:
+        app.config["VERIFICATION_CODE_TTL_SECONDS"] = ttl_seconds
+        response = client.post("/auth/register", json={"email": "fay@school.edu"})
+        assert response.status_code == 201
+        return response.json["dev_code"]
+
+    return client, register
+
+
+def _verify(client, code: str):
+    return client.post("/auth/verify", json={"email": "fay@school.edu", "code": code})
+
+
+def test_code_lives_off_the_user_doc_and_is_used_once(signup):
+    from app import mongo
+
+    client, register = signup
+    code = register()
+    assert "verification_code" not in mongo.db.users.find_one({"email": "fay@school.edu"})
+
+    assert _verify(client, code).status_code == 200
+    assert _verify(client, code).status_code == 400
+
+
+def test_expired_code_is_rejected(signup):
+    client, register = signup
+    code = register(ttl_seconds=0)
+
+    assert _verify(client, code).status_code == 400
+    # A fresh code works again
+    assert _verify(client, register()).status_code == 200
+
+
+def test_wrong_guesses_lock_the_code(app, signup):
+    client, register = signup
+    app.config["VERIFICATION_MAX_ATTEMPTS"] = 3
+    code = register()
+    wrong = "000000" if code != "000000" else "111111"
+
+    assert [_verify(client, wrong).status_code for _ in range(3)] == [400, 400, 400]
+    assert _verify(client, code).status_code == 429
+
+
+def test_email_limit_applies_across_ips(limited_app):
+    limited_app.config.update(AUTH_RATE_PER_MINUTE_IP=1000, AUTH_RATE_BURST_IP=100,
+                              AUTH_RATE_PER_MINUTE_EMAIL=0.001, AUTH_RATE_BURST_EMAIL=2)
+    client = limited_app.test_client()
+
+    statuses = [
+        client.post("/auth/login", json={"email": "Fay@school.edu "},
+                    environ_base={"REMOTE_ADDR": f"10.0.0.{i}"}).status_code
+        for i in range(3)
+    ]
+    assert 429 not in statuses[:2] and statuses[2] == 429
+    assert int(client.post("/auth/login", json={"email": "fay@school.edu"}).headers["Retry-After"]) >= 1
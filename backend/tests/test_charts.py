@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+
+import pytest
+from bson.objectid import ObjectId
+
+from app import mongo
+from app.services.charts import (
+    BACKFILL_STATE_ID, CHART_PENDING, backfill_candidates_query, backfill_charts, process_chart,
+)
+from app.services.matching import run_matching
+from synthetic_users import generate_users
+
+
+def test_landed_chart_is_rescored_by_incremental_matching(app):
+    users = generate_users(120, seed=5, moon_rate=0)
+    mongo.db.users.insert_many(users)
+    app.config["MATCHING_INCREMENTAL"] = True
+    run_matching(engine="numpy")
+
+    user = users[0]
+    mongo.db.users.update_one({"_id": user["_id"]}, {"$set": {
+        "birth_time": "14:30",
+        "birth_location": "Orlando, FL",
+        "chart_status": CHART_PENDING,
+        "chart_requested_at": datetime.now(timezone.utc),
+    }})
+    assert process_chart(mongo.db.users.find_one({"_id": user["_id"]}))
+
+    stats = run_matching(engine="numpy")["stats"]
+    assert stats["users_changed"] == 1
+    assert mongo.db.users.find_one({"_id": user["_id"]})["zodiac"]["moon"]
+
+
+def test_backfill_recomputes_abbreviated_signs(app):
+    birth = {"dob": "2004-05-06", "birth_time": "10:30", "birth_location": "Orlando, FL"}
+    mongo.db.users.insert_many([
+        {**birth, "name": "stale", "zodiac": {"sun": "Taurus", "moon": "Sag", "rising": "Can"}},
+        {**birth, "name": "done", "zodiac": {"sun": "Taurus", "moon": "Sagittarius", "rising": "Cancer"}},
+        {**birth, "name": "missing", "zodiac": {"sun": "Taurus", "moon": None, "rising": None}},
+    ])
+
+    names = {u["name"] for u in mongo.db.users.find(backfill_candidates_query())}
+    assert names == {"stale", "missing"}
+
+
+@pytest.fixture
+def bulk_updates(monkeypatch):
+    """mongomock 4.3 predates the `sort` pymongo 4.11 passes for UpdateOne."""
+    builder = pytest.importorskip("mongomock.collection").BulkOperationBuilder
+    add_update = builder.add_update
+    monkeypatch.setattr(builder, "add_update",
+                        lambda self, *args, sort=None, **kwargs: add_update(self, *args, **kwargs))
+
+
+def test_backfill_resumes_from_its_checkpoint(app, bulk_updates):
+    birth = {"dob": "2004-05-06", "birth_time": "10:30", "zodiac": {"sun": "Taurus"}}
+    ids = sorted(ObjectId() for _ in range(5))
+    # The first user never resolves, so only the checkpoint keeps it from being redone
+    mongo.db.users.insert_many([
+        {**birth, "_id": _id, "name": f"u{i}", "birth_location": "Atlantis" if i == 0 else "Orlando, FL"}
+        for i, _id in enumerate(ids)
+    ])
+
+    def interrupt(stats):
+        raise KeyboardInterrupt
+
+    assert backfill_charts(workers=1, batch_size=2, limit=2)["processed"] == 2
+    with pytest.raises(KeyboardInterrupt):
+        backfill_charts(workers=1, batch_size=2, on_batch=interrupt)
+    state = mongo.db.backfills.find_one({"_id": BACKFILL_STATE_ID})
+    assert (state["last_id"], state["processed"]) == (ids[3], 4)
+
+    stats = backfill_charts(workers=1, batch_size=2)
+    assert (stats["processed"], stats["completed"]) == (1, 1)
+    statuses = [u["chart_status"] for u in mongo.db.users.find().sort("_id", 1)]
+    assert statuses == ["sun_only"] + ["complete"] * 4
+
+    # --restart only revisits what is still missing its signs
+    stats = backfill_charts(workers=1, batch_size=2, restart=True)
+    assert (stats["processed"], stats["sun_only"]) == (1, 1)
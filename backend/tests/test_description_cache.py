@@ -0,0 +1,43 @@
+import pytest
+
+from app.services.description_cache import DescriptionCache
+
+
+def _user(name: str, sun: str = "Leo") -> dict:
+    return {"name": name, "zodiac": {"sun": sun}, "hobbies": ["music", "coffee"]}
+
+
+@pytest.fixture
+def cache(app):
+    return DescriptionCache(collection="description_cache_test")
+
+
+def test_cached_blurb_is_served_with_the_other_pairs_names(cache):
+    cache.put(
+        _user("Alex Smith"), _user("Jordan Lee"), 88,
+        "Alex Smith and Jordan Lee are 88% aligned — Alex will drag Jordan to every concert.",
+    )
+
+    [text] = cache.get_many([(_user("Sam Park"), _user("Riley Chen"), 88)])
+
+    assert text == "Sam Park and Riley Chen are 88% aligned — Sam will drag Riley to every concert."
+    for leaked in ("Alex", "Jordan", "Smith", "Lee"):
+        assert leaked not in text
+
+
+@pytest.mark.parametrize("name1, name2, description", [
+    # Last name left after substitution
+    ("Alex Smith", "Jordan Lee", "Alex and Jordan: the Lee household approves at 88%."),
+    # Bare score without a percent sign
+    ("Alex Smith", "Jordan Lee", "Alex and Jordan score 88 out of 100."),
+    # Name doubles as a sign word, so substitution would mangle the astrology
+    ("Leo Grant", "Jordan Lee", "Two Leo suns: Leo and Jordan are 88% aligned."),
+    # Shared first name is ambiguous
+    ("Alex Smith", "Alex Lee", "Alex and Alex are 88% aligned."),
+])
+def test_refuses_to_cache_blurbs_that_keep_pair_details(cache, name1, name2, description):
+    cache.put(_user(name1), _user(name2), 88, description)
+
+    assert cache.get_many([(_user("Sam Park"), _user("Riley Chen"), 88)]) == [None]
+    assert cache.counters["uncacheable"] == 1
+    assert cache.counters["stores"] == 0
@@ -0,0 +1,28 @@
+import pytest
+
+from app.utils.gazetteer import resolve_location
+
+
+def _place(text: str):
+    place = resolve_location(text)
+    return place and (place["name"], place["country"], place["region"])
+
+
+@pytest.mark.parametrize("text, expected", [
+    # "de" must not be read as Delaware, nor "and" as Andorra
+    ("Paris, Ile-de-France, France", ("Paris", "FR", None)),
+    ("Paris, Texas", ("Paris", "US", "TX")),
+    ("Portland, ME", ("Portland", "US", "ME")),
+    ("Portland, Oregon", ("Portland", "US", "OR")),
+    ("Orlando, FL 32789", ("Orlando", "US", "FL")),
+    ("Orlando Florida", ("Orlando", "US", "FL")),
+    ("Saint Petersburg, FL", ("St. Petersburg", "US", "FL")),
+    ("St. Petersburg, FL", ("St. Petersburg", "US", "FL")),
+    ("Saint Petersburg", ("Saint Petersburg", "RU", None)),
+])
+def test_resolves_qualified_places(text, expected):
+    assert _place(text) == expected
+
+
+def test_contradicting_qualifier_rejects_city():
+    assert _place("Orlando, Texas") is None
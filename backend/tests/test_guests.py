@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from app import mongo
+from app.indexes import USER_INDEXES
+
+
+def _guest(client) -> tuple:
+    response = client.post("/auth/guest")
+    assert response.status_code == 201
+    return response.json["user"]["id"], {"Authorization": f"Bearer {response.json['token']}"}
+
+
+def _doc(user_id: str) -> dict:
+    from bson.objectid import ObjectId
+
+    return mongo.db.users.find_one({"_id": ObjectId(user_id)})
+
+
+def test_guest_lives_in_the_token_until_first_save(app):
+    app.config["AUTH_RATE_LIMIT_ENABLED"] = False
+    client = app.test_client()
+    user_id, headers = _guest(client)
+
+    assert mongo.db.users.count_documents({}) == 0
+    me = client.get("/users/me", headers=headers).json["user"]
+    assert (me["id"], me["is_guest"], me["email_verified"]) == (user_id, True, True)
+
+
+def test_first_save_inserts_guest_with_expiry_and_later_saves_keep_it(app):
+    app.config.update(AUTH_RATE_LIMIT_ENABLED=False, GUEST_TTL_DAYS=3)
+    client = app.test_client()
+    user_id, headers = _guest(client)
+
+    assert client.put("/users/me", headers=headers, json={"name": "Gia", "hobbies": ["chess"]}).status_code == 200
+    doc = _doc(user_id)
+    assert (doc["name"], doc["hobbies"], doc["is_guest"]) == ("Gia", ["chess"], True)
+    assert doc["email"] == f"guest_{user_id}@orbit.guest"
+    assert doc["guest_expires_at"] - doc["created_at"] == timedelta(days=3)
+
+    # $setOnInsert: a second save doesn't reset the guest's fields
+    assert client.put("/users/me", headers=headers, json={"name": "Gianna"}).status_code == 200
+    again = _doc(user_id)
+    assert (again["name"], again["hobbies"]) == ("Gianna", ["chess"])
+    assert (again["created_at"], again["guest_expires_at"]) == (doc["created_at"], doc["guest_expires_at"])
+
+
+def test_onboarded_guest_loses_expiry(app):
+    app.config["AUTH_RATE_LIMIT_ENABLED"] = False
+    client = app.test_client()
+    user_id, headers = _guest(client)
+
+    response = client.put("/users/me", headers=headers, json={"name": "Hal", "onboarding_complete": True})
+    assert response.status_code == 200
+    assert "guest_expires_at" not in _doc(user_id)
+
+
+def test_guest_expiry_has_a_ttl_index():
+    ttl = [index.document for index in USER_INDEXES if "guest_expires_at" in index.document["key"]]
+    assert ttl and ttl[0]["expireAfterSeconds"] == 0
@@ -0,0 +1,48 @@
+import random
+
+import numpy as np
+
+from app.services.matching import calculate_pair_score
+from app.services.scoring import _hobby_overlap, pack_masks
+from app.utils.hobbies import HobbyVocabulary, hobby_overlap
+
+
+def _hobby_lists(seed: int, vocabulary: int = 150, users: int = 40) -> list:
+    # Past 64 distinct hobbies, so masks span several uint64 words
+    rng = random.Random(seed)
+    words = [f"hobby{i}" for i in range(vocabulary)]
+    return [rng.sample(words, rng.randint(0, 12)) + rng.sample(words, 2) for _ in range(users)]
+
+
+def test_mask_overlap_matches_set_intersection():
+    lists = _hobby_lists(seed=1)
+    vocab = HobbyVocabulary()
+    masks = [vocab.mask(hobbies) for hobbies in lists]
+
+    assert vocab.words == 3
+    for a, b in zip(lists, masks):
+        for c, d in zip(lists, masks):
+            assert hobby_overlap(b, d) == len(set(a) & set(c))
+
+
+def test_packed_popcount_matches_python_masks():
+    lists = _hobby_lists(seed=2)
+    vocab = HobbyVocabulary()
+    masks = [vocab.mask(hobbies) for hobbies in lists]
+    packed = pack_masks(masks, vocab.words)
+    idx = np.arange(len(masks))
+
+    expected = [[hobby_overlap(a, b) for b in masks] for a in masks]
+    assert _hobby_overlap(packed, idx, idx).tolist() == expected
+
+
+def test_masked_pair_score_matches_set_based_score():
+    lists = _hobby_lists(seed=3, users=10)
+    vocab = HobbyVocabulary()
+    users = [{"hobbies": hobbies, "zodiac": {"sun": "Leo"}} for hobbies in lists]
+    users.append({"zodiac": {"sun": "Aries"}})  # no hobbies at all
+    masks = [vocab.mask(u.get("hobbies")) for u in users]
+
+    for i, u1 in enumerate(users):
+        for j, u2 in enumerate(users):
+            assert calculate_pair_score(u1, u2, (masks[i], masks[j])) == calculate_pair_score(u1, u2)
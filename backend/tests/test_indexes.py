@@ -0,0 +1,47 @@
+import pytest
+
+from app import mongo
+from app.indexes import MATCH_INDEXES, USER_INDEXES, check_query_plans, hot_queries
+
+Cursor = pytest.importorskip("mongomock.collection").Cursor
+
+INDEXES = {"users": USER_INDEXES, "matches": MATCH_INDEXES}
+
+
+def _plan(stage: str, *children) -> dict:
+    plan = {"stage": stage}
+    if len(children) == 1:
+        plan["inputStage"] = children[0]
+    elif children:
+        plan["inputStages"] = list(children)
+    return plan
+
+
+def test_every_hot_query_leads_an_index(app):
+    for name, collection, query, sort in hot_queries(mongo.db):
+        fields = set(query) | {field for field, _ in sort or []}
+        usable = [
+            index.document for index in INDEXES[collection.name]
+            if next(iter(index.document["key"])) in fields
+            and all(query.get(key) == value
+                    for key, value in index.document.get("partialFilterExpression", {}).items())
+        ]
+        assert usable, f"no index for {name}"
+
+
+def test_collscans_are_reported_wherever_they_sit_in_the_plan(app, monkeypatch):
+    # mongomock has no explain(); hand back the plan shapes Mongo produces
+    plans = {
+        "email": _plan("FETCH", _plan("IXSCAN")),
+        "onboarding_complete": {"queryPlan": _plan("FETCH", _plan("IXSCAN"))},
+        "chart_status": _plan("SORT", _plan("OR", _plan("IXSCAN"), _plan("COLLSCAN"))),
+        "participants": {"queryPlan": _plan("COLLSCAN")},
+    }
+    monkeypatch.setattr(Cursor, "explain", lambda self: {
+        "queryPlanner": {"winningPlan": plans[next(iter(self._spec))]},
+    }, raising=False)
+
+    failures = check_query_plans(mongo.db)
+
+    assert [failure.split(":")[0] for failure in failures] == ["worker", "matches/me"]
+    assert "COLLSCAN on matches" in failures[1]
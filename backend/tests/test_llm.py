@@ -0,0 +1,98 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.llm import _template_description, generate_cosmic_descriptions
+
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    """
+    Chat completions endpoint. The person-1 name picks the behaviour:
+    "Flaky*" gets one 429 then succeeds, "Throttled*" always gets 429,
+    "Broken*" gets a 400; everyone else succeeds.
+    """
+
+    attempts = {}
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["messages"][1]["content"]
+        name = prompt.split("Person 1: ")[1].split("\n")[0]
+        with self.lock:
+            self.attempts[name] = attempt = self.attempts.get(name, 0) + 1
+
+        if name.startswith("Throttled") or (name.startswith("Flaky") and attempt == 1):
+            return self._send(429, {"error": {"message": "slow down", "type": "rate_limit"}})
+        if name.startswith("Broken"):
+            return self._send(400, {"error": {"message": "bad request"}})
+        return self._send(200, {
+            "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "test",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": f" Blurb for {name} "}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        })
+
+    def _send(self, status: int, payload: dict):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def openai_server(monkeypatch):
+    FakeOpenAI.attempts = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/v1")
+    yield FakeOpenAI.attempts
+    server.shutdown()
+
+
+def _pair(name: str, score: int = 80) -> tuple:
+    return ({"name": name, "zodiac": {"sun": "Leo"}}, {"name": "Partner", "zodiac": {"sun": "Aries"}}, score)
+
+
+def test_retries_rate_limited_requests(openai_server):
+    pairs = [_pair(f"Flaky{i}") for i in range(4)] + [_pair("Steady")]
+    stats = {}
+
+    descriptions = generate_cosmic_descriptions(pairs, max_concurrency=5, max_retries=2, stats=stats)
+
+    assert descriptions == [f"Blurb for {u1['name']}" for u1, _, _ in pairs]
+    assert stats["llm_retries"] == 4
+    assert stats["llm_fallbacks"] == 0
+    assert all(openai_server[f"Flaky{i}"] == 2 for i in range(4))
+
+
+def test_falls_back_to_template_when_retries_run_out(openai_server):
+    pairs = [_pair("Throttled", 85), _pair("Broken", 65), _pair("Steady")]
+    stats = {}
+
+    descriptions = generate_cosmic_descriptions(pairs, max_retries=1, stats=stats)
+
+    assert descriptions[0] == _template_description(*pairs[0])
+    assert descriptions[1] == _template_description(*pairs[1])
+    assert descriptions[2] == "Blurb for Steady"
+    assert stats["llm_fallbacks"] == 2
+    # 429s are retried; a 400 is not
+    assert openai_server["Throttled"] == 2
+    assert openai_server["Broken"] == 1
+
+
+def test_uses_template_without_api_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "")
+    pairs = [_pair("Steady", 90)]
+    stats = {}
+
+    assert generate_cosmic_descriptions(pairs, stats=stats) == [_template_description(*pairs[0])]
+    assert stats["llm_fallbacks"] == 1
@@ -0,0 +1,80 @@
+import pytest
+from bson.objectid import ObjectId
+from flask_jwt_extended import create_access_token
+
+Collection = pytest.importorskip("mongomock.collection").Collection
+
+
+def test_revealed_match_with_deleted_partner(app, monkeypatch):
+    # mongomock can't run $lookup with let/pipeline, so hand back what Mongo
+    # returns when the partner doc is gone: an empty join
+    user_id, partner_id = ObjectId(), ObjectId()
+    match = {"_id": ObjectId(), "user1_id": user_id, "user2_id": partner_id,
+             "compatibility_score": 77, "partner": []}
+    monkeypatch.setattr(Collection, "aggregate", lambda self, pipeline: iter([dict(match)]))
+    app.config["MATCH_REVEAL_DATE"] = "2020-01-01T00:00:00"
+    token = create_access_token(identity=str(user_id))
+
+    response = app.test_client().get("/matches/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert response.json["status"] == "revealed"
+    assert response.json["match"]["compatibility_score"] == 77
+    assert "partner" not in response.json["match"]
+
+
+def test_job_status_takes_admin_secret_from_header_only(app):
+    from app.services.jobs import enqueue_matching_job
+
+    job, _ = enqueue_matching_job({})
+    client = app.test_client()
+    path = f"/matches/jobs/{job['_id']}"
+    secret = app.config["SECRET_KEY"]
+
+    assert client.get(path, query_string={"admin_secret": secret}).status_code == 401
+    response = client.get(path, headers={"X-Admin-Secret": secret})
+    assert response.status_code == 200
+    assert response.json["job"]["status"] == "queued"
+
+
+def _revealed_pair(app):
+    from app import mongo
+    from app.models.match import create_match_doc
+    from app.services.reveal import materialize_reveal_payloads
+
+    users = [{"_id": ObjectId(), "name": name, "instagram": f"@{name.lower()}", "onboarding_complete": True,
+              "zodiac": {"sun": "Leo", "moon": None, "rising": None}} for name in ("Ana", "Ben")]
+    mongo.db.users.insert_many(users)
+    match = create_match_doc(users[0]["_id"], users[1]["_id"], 81, {}, "Stars!", "valentine")
+    match["_id"] = mongo.db.matches.insert_one(match).inserted_id
+    materialize_reveal_payloads([match], {u["_id"]: u for u in users})
+    app.config["MATCH_REVEAL_DATE"] = "2020-01-01T00:00:00"
+    return [{"Authorization": f"Bearer {create_access_token(identity=str(u['_id']))}"} for u in users], users
+
+
+def test_partner_profile_edit_reaches_reveal_payload(app):
+    (ana, ben), _ = _revealed_pair(app)
+    client = app.test_client()
+    assert client.get("/matches/me", headers=ana).json["match"]["partner"]["name"] == "Ben"
+
+    assert client.put("/users/me", headers=ben, json={"name": "Benji", "instagram": "@benji"}).status_code == 200
+
+    partner = client.get("/matches/me", headers=ana).json["match"]["partner"]
+    assert (partner["name"], partner["instagram"]) == ("Benji", "@benji")
+
+
+def test_landed_chart_reaches_reveal_payload(app, monkeypatch):
+    from datetime import datetime, timezone
+
+    from app import mongo
+    from app.services import charts
+
+    (ana, _), users = _revealed_pair(app)
+    requested_at = datetime.now(timezone.utc)
+    mongo.db.users.update_one({"_id": users[1]["_id"]}, {"$set": {"chart_requested_at": requested_at}})
+    monkeypatch.setattr(charts, "compute_chart", lambda user: {"moon": "Pisces", "rising": "Virgo"})
+
+    assert charts.process_chart({"_id": users[1]["_id"], "chart_requested_at": requested_at})
+
+    zodiac = app.test_client().get("/matches/me", headers=ana).json["match"]["partner"]["zodiac"]
+    assert (zodiac["moon"], zodiac["rising"]) == ("Pisces", "Virgo")
@@ -0,0 +1,136 @@
+from datetime import datetime, timezone
+
+import pytest
+from bson.objectid import ObjectId
+
+from app import mongo
+from app.models.match import create_match_doc
+from app.services.matching import (
+    MATCHES_STAGING, _block_pairs, _block_users, _gender_compatible, _replace_matches, run_matching,
+)
+from synthetic_users import generate_users
+
+
+def _population(n: int, seed: int) -> list:
+    users = generate_users(n, seed=seed)
+    for user in users[::7]:
+        user["hobbies"] = []
+    for user in users[::11]:
+        user.pop("looking_for")
+    return users
+
+
+def _matches() -> list:
+    return sorted(
+        (m["user1_id"], m["user2_id"], m["compatibility_score"], sorted(m["astro_breakdown"].items()))
+        for m in mongo.db.matches.find()
+    )
+
+
+def _run(app, engine: str, **config) -> list:
+    app.config.update(config)
+    result = run_matching(engine=engine, mode="greedy")
+    assert result["matches_created"] > 0
+    return _matches()
+
+
+@pytest.mark.parametrize("config", [
+    {},
+    {"MATCHING_TOP_K": 2, "MATCHING_SHARD_ROWS": 64},
+    {"MATCHING_WORKERS": 2, "MATCHING_SHARD_ROWS": 64},
+])
+def test_numpy_engine_matches_python_reference(app, config):
+    mongo.db.users.insert_many(_population(400, seed=7))
+
+    expected = _run(app, "python")
+    assert _run(app, "numpy", **config) == expected
+
+
+def test_incremental_numpy_matches_python_reference(app):
+    users = _population(300, seed=11)
+    mongo.db.users.insert_many(users)
+    app.config["MATCHING_INCREMENTAL"] = True
+    assert _run(app, "numpy") == _run(app, "python")
+
+    # Edit a few profiles after the snapshot, then rescore incrementally
+    for user in users[:20]:
+        mongo.db.users.update_one({"_id": user["_id"]}, {"$set": {
+            "hobbies": ["chess", "poetry"],
+            "zodiac.moon": "Leo",
+            "updated_at": datetime.now(timezone.utc),
+        }})
+    assert _run(app, "numpy") == _run(app, "python")
+
+
+def test_incremental_handles_new_and_departed_users(app):
+    users = _population(300, seed=5)
+    mongo.db.users.insert_many(users[:280])
+    app.config.update(MATCHING_INCREMENTAL=True, MATCHING_TOP_K=3)
+    assert _run(app, "numpy") == _run(app, "python")
+
+    # New signups, users leaving the pool and an edit, all since the snapshot
+    mongo.db.users.insert_many(users[280:])
+    for user in users[:30:3]:
+        mongo.db.users.update_one({"_id": user["_id"]}, {"$set": {"onboarding_complete": False}})
+    mongo.db.users.update_one({"_id": users[40]["_id"]}, {"$set": {
+        "gender": "nonbinary", "updated_at": datetime.now(timezone.utc),
+    }})
+
+    stats = run_matching(engine="numpy", mode="greedy")["stats"]
+    assert stats["users_changed"] == 21
+    assert stats["rows_rescored"] > stats["users_changed"]
+    assert stats["candidates_reused"] > 0
+    numpy_matches = _matches()
+    assert numpy_matches == _run(app, "python")
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_optimal_reports_uplift_over_production_greedy(app, engine):
+    mongo.db.users.insert_many(_population(150, seed=3))
+    greedy = run_matching(engine=engine, mode="greedy")["stats"]
+
+    stats = run_matching(engine=engine, mode="optimal")["stats"]
+    assert stats["greedy_total_score"] == greedy["total_score"]
+    assert stats["greedy_pairs"] == greedy["pairs"]
+    assert stats["total_score"] >= stats["greedy_total_score"]
+
+
+def test_optimal_falls_back_to_greedy_above_size_cap(app):
+    mongo.db.users.insert_many(_population(150, seed=3))
+    expected = _run(app, "numpy")
+
+    app.config["MATCHING_OPTIMAL_MAX_USERS"] = 100
+    stats = run_matching(engine="numpy", mode="optimal")["stats"]
+    assert stats["optimal_skipped"] == "150 users > 100"
+    assert _matches() == expected
+
+
+def test_blocking_prunes_exactly_the_incompatible_pairs():
+    users = _population(200, seed=9)
+    for user in users[::13]:
+        user.pop("interested_in")
+    blocks = _block_users(users)
+
+    compatible = {
+        (i, j) for i in range(len(users)) for j in range(i + 1, len(users))
+        if _gender_compatible(users[i], users[j])
+    }
+    scored = list(_block_pairs(blocks))
+    assert len(scored) == len(set(scored)) == blocks["pairs_scored"]
+    assert set(scored) == compatible
+    assert blocks["pairs_pruned"] == 200 * 199 // 2 - len(compatible) > 0
+
+
+def test_replace_matches_swaps_in_the_whole_new_set(app):
+    def docs(count):
+        return [create_match_doc(ObjectId(), ObjectId(), 70, {}, "", "valentine") for _ in range(count)]
+
+    mongo.db.matches.insert_many(docs(5))
+    new = docs(23)
+
+    stats = _replace_matches(new, batch_size=10)
+
+    assert sorted(m["_id"] for m in mongo.db.matches.find()) == sorted(m["_id"] for m in new)
+    assert MATCHES_STAGING not in mongo.db.list_collection_names()
+    assert {"participants", "user1_id", "user2_id"} <= set(mongo.db.matches.index_information())
+    assert stats["write_seconds"] >= 0 and stats["swap_seconds"] >= 0
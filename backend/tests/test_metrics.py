@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+
+from app.metrics import CommandMetrics
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_requests_counted_by_endpoint_not_path(app):
+    client = app.test_client()
+    before = _sample("orbit_http_requests_total", method="GET", endpoint="health", status="200")
+    unmatched = _sample("orbit_http_requests_total", method="GET", endpoint="unmatched", status="404")
+
+    client.get("/health")
+    client.get("/health")
+    client.get("/no/such/path/123")
+
+    assert _sample("orbit_http_requests_total", method="GET", endpoint="health", status="200") == before + 2
+    assert _sample("orbit_http_requests_total", method="GET", endpoint="unmatched", status="404") == unmatched + 1
+    assert "orbit_http_requests_total" in client.get("/metrics").get_data(as_text=True)
+
+
+def test_metrics_token_guards_endpoint(app):
+    app.config["METRICS_TOKEN"] = "scrape-me"
+    client = app.test_client()
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-me"}).status_code == 200
+
+
+def test_description_fallback_and_chart_latency_recorded(app):
+    from app.services.charts import compute_chart
+    from app.services.llm import generate_cosmic_description
+
+    fallbacks = _sample("orbit_llm_descriptions_total", source="fallback")
+    sun_only = _sample("orbit_natal_chart_duration_seconds_count", status="sun_only")
+
+    # OPENAI_API_KEY is empty under test, so this takes the template path
+    generate_cosmic_description({"name": "A"}, {"name": "B"}, 80)
+    compute_chart({"dob": "2001-05-04", "birth_time": "10:30", "birth_location": "Nowhere, Atlantis"})
+
+    assert _sample("orbit_llm_descriptions_total", source="fallback") == fallbacks + 1
+    assert _sample("orbit_natal_chart_duration_seconds_count", status="sun_only") == sun_only + 1
+
+
+def test_command_listener_labels_collection():
+    listener = CommandMetrics()
+    labels = {"command": "find", "collection": "users", "outcome": "success"}
+    failed = {"command": "getMore", "collection": "matches", "outcome": "failure"}
+    before, before_failed = _sample("orbit_mongo_commands_total", **labels), _sample("orbit_mongo_commands_total", **failed)
+
+    listener.started(SimpleNamespace(command_name="find", command={"find": "users"}, request_id=1))
+    listener.started(SimpleNamespace(command_name="getMore",
+                                     command={"getMore": 7, "collection": "matches"}, request_id=2))
+    listener.succeeded(SimpleNamespace(command_name="find", request_id=1, duration_micros=1500))
+    listener.failed(SimpleNamespace(command_name="getMore", request_id=2, duration_micros=900))
+
+    assert _sample("orbit_mongo_commands_total", **labels) == before + 1
+    assert _sample("orbit_mongo_commands_total", **failed) == before_failed + 1
+    assert listener._collections == {}
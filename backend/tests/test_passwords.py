@@ -0,0 +1,39 @@
+import json
+import os
+import re
+
+from app.services import passwords
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_register_answers_503_when_hashing_pool_is_full(app, monkeypatch):
+    monkeypatch.setattr(passwords, "_executor", None)
+    monkeypatch.setattr(passwords, "_slots", None)
+    app.config.update(BCRYPT_ROUNDS=4, BCRYPT_WORKERS=1, BCRYPT_QUEUE_DEPTH=1,
+                      AUTH_RATE_LIMIT_ENABLED=False, ALLOWED_EMAIL_DOMAINS=["school.edu"])
+    _, slots = passwords._pool()
+    client = app.test_client()
+
+    # Every slot held by in-flight hashes: the next sign-up doesn't wait
+    for _ in range(2):
+        slots.acquire(blocking=False)
+    response = client.post("/auth/register", json={"email": "a@school.edu", "password": "pw"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+    slots.release()
+    response = client.post("/auth/register", json={"email": "a@school.edu", "password": "pw"})
+    assert response.status_code == 201
+
+
+def test_deployed_threads_outnumber_hashing_slots(app):
+    with open(os.path.join(BACKEND_DIR, "railway.json")) as f:
+        command = json.load(f)["deploy"]["startCommand"]
+    with open(os.path.join(BACKEND_DIR, "Procfile")) as f:
+        assert command in f.read()
+
+    # Sync workers serve one request at a time, so the pool could never fill
+    assert "--worker-class gthread" in command
+    threads = int(re.search(r"--threads (\d+)", command).group(1))
+    assert app.config["BCRYPT_WORKERS"] + app.config["BCRYPT_QUEUE_DEPTH"] < threads
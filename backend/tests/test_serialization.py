@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from bson.objectid import ObjectId
+from flask.json.provider import DefaultJSONProvider
+
+from app import mongo
+from app.models.match import PARTNER_FIELDS, PARTNER_PROJECTION, serialize_match
+from app.models.user import USER_PROJECTION, create_user_doc, serialize_user
+from app.utils.json_provider import OrjsonProvider
+
+
+def test_projected_user_serializes_like_the_full_doc(app):
+    user = create_user_doc(email="dee@school.edu", name="Dee", password_hash="$2b$12$secret")
+    user_id = mongo.db.users.insert_one(user).inserted_id
+    full = mongo.db.users.find_one({"_id": user_id})
+
+    projected = mongo.db.users.find_one({"_id": user_id}, dict(USER_PROJECTION))
+    assert "password_hash" not in projected
+    assert serialize_user(projected) == serialize_user(full)
+    assert "password_hash" not in serialize_user(full)
+
+
+def test_partner_projection_covers_serialized_partner(app):
+    partner = create_user_doc(email="eli@school.edu", name="Eli", password_hash="$2b$12$secret")
+    partner_id = mongo.db.users.insert_one(partner).inserted_id
+    match = {"_id": ObjectId(), "compatibility_score": 90}
+
+    projected = mongo.db.users.find_one({"_id": partner_id}, dict(PARTNER_PROJECTION))
+    assert serialize_match(match, projected) == serialize_match(match, partner)
+    assert set(serialize_match(match, projected)["partner"]) == set(PARTNER_FIELDS)
+
+
+def test_orjson_provider_matches_default_provider(app):
+    body = {
+        "user": {"name": "Zoë", "hobbies": ["chess"], "zodiac": {"sun": "Leo", "moon": None}},
+        "score": 87, "ratio": 0.5, "price": Decimal("1.50"),
+        "when": datetime(2026, 2, 13, 20, 0, tzinfo=timezone.utc), "ok": True,
+    }
+    fast, default = OrjsonProvider(app), DefaultJSONProvider(app)
+
+    assert fast.loads(fast.dumps(body)) == default.loads(default.dumps(body))
+    # Compact response bodies are byte-identical for ASCII text
+    ascii_body = {**body, "user": {**body["user"], "name": "Zoe"}}
+    assert fast.response(ascii_body).data == default.response(ascii_body).data
@@ -0,0 +1,8 @@
+from bench_startup import probe
+
+
+def test_app_boots_without_heavy_modules():
+    # Fresh interpreter, like a cold container or a recycled gunicorn worker
+    result = probe()
+
+    assert result["heavy"] == []
@@ -0,0 +1,11 @@
+from synthetic_users import generate_users
+
+
+def test_same_seed_same_population():
+    assert generate_users(50, seed=3) == generate_users(50, seed=3)
+
+
+def test_ids_are_unique_and_vary_with_seed():
+    ids = [u["_id"] for u in generate_users(500, seed=3)]
+    assert len(set(ids)) == len(ids)
+    assert ids[0] != generate_users(1, seed=4)[0]["_id"]
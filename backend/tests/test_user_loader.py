@@ -0,0 +1,32 @@
+from bson.objectid import ObjectId
+from flask_jwt_extended import create_access_token
+
+from app.models.user import create_user_doc
+
+
+def _loads(metrics: str, endpoint: str, outcome: str) -> float:
+    line = f'orbit_user_loads_total{{endpoint="{endpoint}",outcome="{outcome}"}} '
+    return next((float(row[len(line):]) for row in metrics.splitlines() if row.startswith(line)), 0.0)
+
+
+def test_loader_outcomes_are_exported(app):
+    app.config["METRICS_TOKEN"] = ""
+    from app import mongo
+
+    user = create_user_doc(email="sam@school.edu")
+    user["_id"] = ObjectId()
+    mongo.db.users.insert_one(user)
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(user['_id']))}"}
+    client = app.test_client()
+    before = client.get("/metrics").get_data(as_text=True)
+
+    # A fresh app context per request, as in production, so the per-request
+    # memo on g doesn't carry over from one request to the next
+    for path in ("/users/me", "/users/me/cosmic"):
+        with app.app_context():
+            assert client.get(path, headers=headers).status_code == 200
+
+    after = client.get("/metrics").get_data(as_text=True)
+    assert _loads(after, "users.get_me", "miss") - _loads(before, "users.get_me", "miss") == 1
+    assert (_loads(after, "users.get_cosmic_profile", "lru")
+            - _loads(before, "users.get_cosmic_profile", "lru")) == 1
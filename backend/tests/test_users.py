@@ -0,0 +1,40 @@
+from bson.objectid import ObjectId
+from flask_jwt_extended import create_access_token
+
+from app import mongo
+from app.models.user import create_user_doc
+
+
+def _signed_in_user() -> tuple:
+    user = create_user_doc(email="cam@school.edu")
+    user["_id"] = ObjectId()
+    user["name"] = "Cam"
+    mongo.db.users.insert_one(user)
+    return user, {"Authorization": f"Bearer {create_access_token(identity=str(user['_id']))}"}
+
+
+def test_me_answers_304_for_a_matching_etag(app):
+    user, headers = _signed_in_user()
+    client = app.test_client()
+
+    first = client.get("/users/me", headers=headers)
+    assert first.status_code == 200 and first.headers["ETag"]
+
+    # Served from the cache: the database isn't read again
+    mongo.db.users.delete_one({"_id": user["_id"]})
+    again = client.get("/users/me", headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.data == b""
+
+
+def test_profile_edit_changes_the_etag(app):
+    _, headers = _signed_in_user()
+    client = app.test_client()
+    for path in ("/users/me", "/users/me/cosmic"):
+        etag = client.get(path, headers=headers).headers["ETag"]
+
+        assert client.put("/users/me", headers=headers, json={"name": f"Cam {path}"}).status_code == 200
+
+        response = client.get(path, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
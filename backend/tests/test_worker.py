@@ -0,0 +1,15 @@
+import importlib
+import sys
+
+import pytest
+
+import app as app_package
+
+
+def test_importing_worker_builds_no_app(monkeypatch):
+    # Spawned scoring processes re-import the worker's __main__
+    monkeypatch.setattr(app_package, "create_app", lambda: pytest.fail("create_app ran on import"))
+    monkeypatch.delitem(sys.modules, "worker", raising=False)
+
+    worker = importlib.import_module("worker")
+    assert callable(worker.main)
@@ -0,0 +1,58 @@
+"""
+Background worker: polls the jobs collection and runs one matching job at a
+time, while a second thread computes pending natal charts. With METRICS_PORT
+set, its metrics (LLM calls, charts, Mongo) are served on that port.
+"""
+
+import threading
+import time
+
+from app import create_app
+from app.services.charts import process_pending_charts
+from app.services.jobs import claim_next_job, ensure_job_indexes, reap_stale_jobs, run_job
+
+
+def chart_loop(app, poll_seconds: float, stale_after: int):
+    """Compute natal charts queued by profile saves; runs beside matching jobs."""
+    with app.app_context():
+        while True:
+            try:
+                if process_pending_charts(stale_after=stale_after):
+                    continue
+            except Exception as e:
+                print(f"Chart worker error: {e}")
+            time.sleep(poll_seconds)
+
+
+def main():
+    # Built here, not at import: spawned scoring processes re-import this
+    # module and must not each build an app (and start index bootstrap)
+    app = create_app()
+    poll_seconds = app.config.get("JOB_POLL_SECONDS", 2)
+    stale_after = app.config.get("JOB_STALE_SECONDS", 600)
+
+    if app.config.get("METRICS_ENABLED") and app.config.get("METRICS_PORT"):
+        from prometheus_client import start_http_server
+        start_http_server(app.config["METRICS_PORT"])
+
+    threading.Thread(
+        target=chart_loop,
+        args=(app, poll_seconds, app.config.get("CHART_STALE_SECONDS", 120)),
+        daemon=True,
+    ).start()
+
+    with app.app_context():
+        ensure_job_indexes()
+        print("Matching worker started")
+        while True:
+            reap_stale_jobs(stale_after)
+            job = claim_next_job()
+            if job is None:
+                time.sleep(poll_seconds)
+                continue
+            print(f"Running job {job['_id']}")
+            run_job(job)
+
+
+if __name__ == "__main__":
+    main()